@@ -3,30 +3,60 @@ Configuration file for YouTube Video Uploader
 Modified for PostgreSQL and Fly.io deployment
 """
 
-import logging
 import os
+# Opt-in cooperative IO: patch before anything imports socket/ssl/threading
+if os.environ.get('USE_GEVENT'):
+    from gevent import monkey
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    # Gemini's gRPC channel does its own IO in C; make its calls yield to the hub
+    from grpc.experimental import gevent as grpc_gevent
+    grpc_gevent.init_gevent()
+
+import logging
 from pathlib import Path
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, send_from_directory, session, redirect, url_for, send_file
+from datetime import datetime
+from flask import Flask, render_template, request, jsonify, send_from_directory, session, redirect, url_for, send_file, has_request_context, Response, make_response
 from flask_session import Session
 import google.generativeai as genai
 import psycopg2
+import psycopg2.pool
+from contextlib import contextmanager
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import NotFound
 import secrets
 import smtplib
 from email.mime.text import MIMEText
 import json
+try:
+    import orjson  # optional C-accelerated JSON; stdlib json is used when missing
+except ImportError:
+    orjson = None
 import re
 import threading
 import uuid
 import subprocess
+import shutil
+import string
+import tempfile
 import time
 import concurrent.futures
+import multiprocessing
+import functools
+import random
+import asyncio
+import hashlib
 from flask_cors import CORS
 import csv
 from threading import Thread
-import time as _time
+import types
+import mmap
+import mimetypes
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # YouTube API imports
 import google_auth_httplib2
@@ -38,92 +68,138 @@ from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s', force=True)
 logger = logging.getLogger(__name__)
 
+# Deployment settings that never change at runtime: snapshot once instead of per request
+_ENV = types.MappingProxyType({k: os.environ.get(k) for k in (
+    'FLY_APP_NAME', 'FLY_MACHINE_ID', 'FLASK_ENV', 'PUBLIC_BASE_URL', 'YOUTUBE_TOKEN_FILE', 'WHISPER_DISABLED',
+    'TRANSCRIPT_CACHE_DIR', 'TRANSCRIBE_TIMEOUT', 'USE_GEVENT',
+    'CLIENT_SECRETS_JSON', 'CLIENT_SECRETS_JSON_B64', 'CLIENT_SECRETS_JSON_BASE64',
+    'YOUTUBE_TOKEN_JSON', 'YOUTUBE_TOKEN_JSON_B64', 'YOUTUBE_TOKEN_JSON_BASE64',
+)})
+_IS_PRODUCTION = bool(_ENV['FLY_APP_NAME'] or _ENV['FLY_MACHINE_ID'] or _ENV['FLASK_ENV'] == 'production')
+_USE_GEVENT = bool(_ENV['USE_GEVENT'])
+
 # --- YouTube credentials hydration for container environments ---
-def _maybe_write_file(path: str, content: str) -> None:
+# Hydration touches the filesystem and decodes base64 blobs, so it runs once on
+# first use (request hook / first upload) rather than on every worker import.
+_HYDRATED = False
+_HYDRATE_LOCK = threading.Lock()
+
+def _maybe_write_file(path: str, content: bytes) -> None:
     try:
         directory = os.path.dirname(path) or '.'
         os.makedirs(directory, exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
+        with open(path, 'wb') as f:
             f.write(content)
     except Exception as e:
         logger.warning(f"Failed to write file {path}: {e}")
 
-def _from_env_json(var_plain: str, var_b64: str) -> str | None:
-    value = os.environ.get(var_plain)
+def _from_env_json(var_plain: str, b64_vars: tuple) -> bytes | None:
+    value = _ENV.get(var_plain)
     if value:
-        return value
-    b64 = os.environ.get(var_b64)
-    if b64:
+        return value.encode('utf-8')
+    for var_b64 in b64_vars:
+        b64 = _ENV.get(var_b64)
+        if not b64:
+            continue
         try:
             import base64
-            return base64.b64decode(b64).decode('utf-8')
+            return base64.b64decode(b64)
         except Exception:
             logger.warning(f"Invalid base64 provided in {var_b64}")
-            return None
     return None
 
+def _credential_env_table() -> tuple:
+    """(plain env var, base64 env vars, destination) entries walked by the hydration hook."""
+    token_dest = _ENV['YOUTUBE_TOKEN_FILE'] or os.path.join('static', 'youtube_token.json')
+    return (
+        ('CLIENT_SECRETS_JSON', ('CLIENT_SECRETS_JSON_B64', 'CLIENT_SECRETS_JSON_BASE64'), 'client_secrets.json'),
+        ('YOUTUBE_TOKEN_JSON', ('YOUTUBE_TOKEN_JSON_B64', 'YOUTUBE_TOKEN_JSON_BASE64'), token_dest),
+    )
+
 def hydrate_youtube_credentials_from_env() -> None:
     """Hydrate YouTube credentials from env vars if present.
 
     Supported:
-    - CLIENT_SECRETS_JSON or CLIENT_SECRETS_JSON_B64 -> writes ./client_secrets.json
-    - YOUTUBE_TOKEN_JSON or YOUTUBE_TOKEN_JSON_B64 -> writes ./static/youtube_token.json
+    - CLIENT_SECRETS_JSON, CLIENT_SECRETS_JSON_B64 or CLIENT_SECRETS_JSON_BASE64 -> writes ./client_secrets.json
+    - YOUTUBE_TOKEN_JSON, YOUTUBE_TOKEN_JSON_B64 or YOUTUBE_TOKEN_JSON_BASE64 -> writes ./static/youtube_token.json
     - YOUTUBE_TOKEN_FILE can override destination path for the token
+
+    Existing destination files are left untouched (and their env values never decoded).
     """
-    try:
-        # client_secrets.json
-        client_json = _from_env_json('CLIENT_SECRETS_JSON', 'CLIENT_SECRETS_JSON_B64')
-        if client_json and not os.path.exists('client_secrets.json'):
-            _maybe_write_file('client_secrets.json', client_json)
-            logger.info('Wrote client_secrets.json from environment')
-
-        # youtube_token.json
-        token_json = _from_env_json('YOUTUBE_TOKEN_JSON', 'YOUTUBE_TOKEN_JSON_B64')
-        if token_json:
-            token_dest = os.environ.get('YOUTUBE_TOKEN_FILE') or os.path.join('static', 'youtube_token.json')
-            if not os.path.exists(token_dest):
-                _maybe_write_file(token_dest, token_json)
-                logger.info(f'Wrote YouTube token to {token_dest} from environment')
-    except Exception as e:
-        logger.warning(f"Failed hydrating YouTube credentials from env: {e}")
+    for var_plain, b64_vars, dest in _credential_env_table():
+        try:
+            if os.path.exists(dest):
+                continue
+            content = _from_env_json(var_plain, b64_vars)
+            if content:
+                _maybe_write_file(dest, content)
+                logger.info(f'Wrote {dest} from environment')
+        except Exception as e:
+            logger.warning(f"Failed hydrating {dest} from env: {e}")
 
-# Run hydration early on import
-hydrate_youtube_credentials_from_env()
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link src to dst when on the same filesystem, otherwise copy the bytes."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
 
-# Sync baked token into mounted static volume if present and missing
-try:
-    baked_token_path = 'youtube_token.json'
-    static_token_path = os.path.join('static', 'youtube_token.json')
-    if os.path.exists(baked_token_path) and not os.path.exists(static_token_path):
-        os.makedirs('static', exist_ok=True)
-        with open(baked_token_path, 'r', encoding='utf-8') as _src, open(static_token_path, 'w', encoding='utf-8') as _dst:
-            _dst.write(_src.read())
-        logger.info('Seeded static/youtube_token.json from baked youtube_token.json')
-except Exception as _e:
-    logger.warning(f'Failed to seed static youtube token: {_e}')
+def _seed_static_token_from_baked() -> None:
+    """Sync baked token into mounted static volume if present and missing."""
+    try:
+        baked_token_path = 'youtube_token.json'
+        static_token_path = os.path.join('static', 'youtube_token.json')
+        if os.path.exists(baked_token_path) and not os.path.exists(static_token_path):
+            os.makedirs('static', exist_ok=True)
+            _link_or_copy(baked_token_path, static_token_path)
+            logger.info('Seeded static/youtube_token.json from baked youtube_token.json')
+    except Exception as _e:
+        logger.warning(f'Failed to seed static youtube token: {_e}')
+
+def _hydrate_credentials_once() -> None:
+    """Run env hydration and baked-token seeding exactly once per process."""
+    global _HYDRATED
+    if _HYDRATED:
+        return
+    with _HYDRATE_LOCK:
+        if _HYDRATED:
+            return
+        hydrate_youtube_credentials_from_env()
+        _seed_static_token_from_baked()
+        _HYDRATED = True
+
+# --- YouTube constants (built once; env is only read at startup) ---
+_YT_UPLOAD_SCOPES = ("https://www.googleapis.com/auth/youtube.upload",)
+_YT_READ_SCOPES = ("https://www.googleapis.com/auth/youtube.readonly",)
+_YT_TITLE_MAX = 100  # YouTube title limit
+_YT_DESC_MAX = 5000  # YouTube description limit
+_YT_CATEGORY_DEFAULT = "22"
+# Token file lookup order: explicit env override, mounted static volume, project root
+_YT_TOKEN_CANDIDATES = tuple(p for p in (
+    _ENV['YOUTUBE_TOKEN_FILE'],
+    os.path.join('static', 'youtube_token.json'),  # Prefer mounted volume path for persistence
+    'youtube_token.json',  # Fallback to project root (not persisted across deploys)
+) if p)
 
 # --- YouTube OAuth Web Flow (for production authorization) ---
 def _get_youtube_scopes():
-    return ["https://www.googleapis.com/auth/youtube.upload"]
+    return _YT_UPLOAD_SCOPES
+
+def _https_base(url: str) -> str:
+    # Force https scheme to match OAuth console configuration
+    base = url.rstrip('/')
+    return 'https://' + base[7:] if base.startswith('http://') else base
+
+# Used outside a request context: PUBLIC_BASE_URL if set, otherwise the Fly app URL
+_FALLBACK_BASE = _https_base(_ENV['PUBLIC_BASE_URL'] or '') or f"https://{_ENV['FLY_APP_NAME'] or 'ai-auto-posting'}.fly.dev"
 
 def _get_redirect_uri(path: str = '/api/youtube/auth/callback') -> str:
-    try:
-        # Build absolute redirect URI based on current request host
-        base = request.host_url.rstrip('/') if request else os.environ.get('PUBLIC_BASE_URL', '')
-        # Force https scheme to match OAuth console configuration
-        if base.startswith('http://'):
-            base = 'https://' + base[len('http://'):]
-        if not base:
-            # Fallback to Fly app URL if provided
-            app_name = os.environ.get('FLY_APP_NAME') or 'ai-auto-posting'
-            base = f"https://{app_name}.fly.dev"
-        return f"{base}{path}"
-    except Exception:
-        app_name = os.environ.get('FLY_APP_NAME') or 'ai-auto-posting'
-        return f"https://{app_name}.fly.dev{path}"
+    # Build absolute redirect URI based on current request host
+    base = _https_base(request.host_url) if has_request_context() else _FALLBACK_BASE
+    return f"{base or _FALLBACK_BASE}{path}"
 
 def _build_oauth_flow(redirect_uri: str, state: str | None = None):
     scopes = _get_youtube_scopes()
@@ -164,6 +240,7 @@ def youtube_auth_callback():
         save_path = _get_youtube_token_file(for_save=True)
         with open(save_path, 'w') as f:
             f.write(creds.to_json())
+        _invalidate_token_path_cache()
         # Clear state
         session.pop('yt_oauth_state', None)
         return jsonify({'success': True, 'message': 'YouTube authorized', 'token_file': save_path})
@@ -172,19 +249,21 @@ def youtube_auth_callback():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 # YouTube Upload Functions (Simplified)
+# Resolved token paths keyed by for_save; read paths are only cached once the file exists
+_TOKEN_PATH_CACHE = {}
+
+def _invalidate_token_path_cache():
+    _TOKEN_PATH_CACHE.clear()
+
 def _get_youtube_token_file(for_save: bool = False) -> str:
     """Return the path to the shared YouTube token file, preferring the mounted static volume.
 
     If for_save is True, returns the preferred save location even if it does not exist yet.
     """
-    candidates = []
-    env_path = os.environ.get('YOUTUBE_TOKEN_FILE')
-    if env_path:
-        candidates.append(env_path)
-    # Prefer mounted volume path for persistence
-    candidates.append(os.path.join('static', 'youtube_token.json'))
-    # Fallback to project root (not persisted across deploys)
-    candidates.append('youtube_token.json')
+    cached = _TOKEN_PATH_CACHE.get(for_save)
+    if cached:
+        return cached
+    candidates = _YT_TOKEN_CANDIDATES
 
     if for_save:
         # Choose first candidate directory that is writable or can be created
@@ -192,6 +271,7 @@ def _get_youtube_token_file(for_save: bool = False) -> str:
             try:
                 directory = os.path.dirname(path) or '.'
                 os.makedirs(directory, exist_ok=True)
+                _TOKEN_PATH_CACHE[True] = path
                 return path
             except Exception:
                 continue
@@ -205,11 +285,11 @@ def _get_youtube_token_file(for_save: bool = False) -> str:
                         static_path = os.path.join('static', 'youtube_token.json')
                         if not os.path.exists(static_path):
                             os.makedirs('static', exist_ok=True)
-                            with open(path, 'r', encoding='utf-8') as _src, open(static_path, 'w', encoding='utf-8') as _dst:
-                                _dst.write(_src.read())
+                            _link_or_copy(path, static_path)
                             logger.info('Copied root youtube_token.json into static volume for persistence')
                 except Exception:
                     pass
+                _TOKEN_PATH_CACHE[False] = path
                 return path
         # Default save location if none exist
         return os.path.join('static', 'youtube_token.json')
@@ -218,8 +298,9 @@ def _get_youtube_token_file(for_save: bool = False) -> str:
 def authenticate_youtube():
     """Authenticate with YouTube API using a shared app credential cached in youtube_token.json."""
     try:
+        _hydrate_credentials_once()
         os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
-        scopes = ["https://www.googleapis.com/auth/youtube.upload"]
+        scopes = _YT_UPLOAD_SCOPES
         token_file = _get_youtube_token_file(for_save=False)
         client_secrets_file = 'client_secrets.json'
 
@@ -252,7 +333,7 @@ def authenticate_youtube():
                 logger.error(f"Client secrets file not found: {client_secrets_file}")
                 return None
             # In production, we cannot run a local server flow. Require pre-provisioned token.
-            if os.environ.get('FLY_APP_NAME') or os.environ.get('FLY_MACHINE_ID') or os.environ.get('FLASK_ENV') == 'production':
+            if _IS_PRODUCTION:
                 logger.error('YouTube token not found in production. Please pre-provision youtube_token.json in the static volume.')
                 return None
             flow = google_auth_oauthlib.flow.InstalledAppFlow.from_client_secrets_file(client_secrets_file, scopes)
@@ -268,11 +349,36 @@ def authenticate_youtube():
         logger.error(f"YouTube authentication error: {e}")
         return None
 
-def upload_video_simple(video_path, title, description, tags, privacy="private"):
-    """Upload video to YouTube with simplified approach"""
+# Background YouTube uploads: jobs run on a small pool so the request thread is freed
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+_UPLOAD_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='yt-upload')
+_UPLOAD_JOBS: dict[str, tuple] = {}  # job_id -> (user_id, Future)
+_UPLOAD_PROGRESS: dict[str, int] = {}  # job_id -> percent complete
+_UPLOAD_DONE_AT: dict[str, float] = {}  # job_id -> monotonic finish time
+_UPLOAD_LOCK = threading.Lock()
+# Finished jobs nobody polled for are dropped after this long
+_UPLOAD_JOB_TTL = 3600
+
+def _mark_upload_done(job_id: str):
+    with _UPLOAD_LOCK:
+        if job_id in _UPLOAD_JOBS:
+            _UPLOAD_DONE_AT[job_id] = time.monotonic()
+
+def _prune_upload_jobs():
+    """Forget finished jobs older than _UPLOAD_JOB_TTL; call with _UPLOAD_LOCK held."""
+    cutoff = time.monotonic() - _UPLOAD_JOB_TTL
+    for job_id in [j for j, done_at in _UPLOAD_DONE_AT.items() if done_at < cutoff]:
+        _UPLOAD_DONE_AT.pop(job_id, None)
+        _UPLOAD_JOBS.pop(job_id, None)
+        _UPLOAD_PROGRESS.pop(job_id, None)
+
+def upload_video_simple(video_path, title, description, tags, privacy="private", progress_cb=None):
+    """Upload video to YouTube with simplified approach.
+
+    progress_cb, if given, is called with the integer upload percentage after each chunk.
+    """
     try:
-        logger.info(f"Starting YouTube upload for: {title}")
-        logger.info(f"Video path: {video_path}")
+        logger.info("Starting YouTube upload for: %s (%s)", title, video_path)
         
         youtube = authenticate_youtube()
         if not youtube:
@@ -284,9 +390,9 @@ def upload_video_simple(video_path, title, description, tags, privacy="private")
         
         request_body = {
             "snippet": {
-                "categoryId": "22",
-                "title": title[:100],  # YouTube title limit
-                "description": description[:5000],  # YouTube description limit
+                "categoryId": _YT_CATEGORY_DEFAULT,
+                "title": title[:_YT_TITLE_MAX],
+                "description": description[:_YT_DESC_MAX],
                 "tags": tags or []
             },
             "status": {
@@ -294,28 +400,42 @@ def upload_video_simple(video_path, title, description, tags, privacy="private")
             }
         }
         
-        logger.info(f"Upload metadata - Title: {title}, Description length: {len(description)}")
-        
-        media_file = googleapiclient.http.MediaFileUpload(
-            video_path, chunksize=1024*1024, resumable=True)
-        
-        request = youtube.videos().insert(
-            part="snippet,status",
-            body=request_body,
-            media_body=media_file
-        )
+        logger.info("Upload metadata - Title: %s, Description length: %d", title, len(description))
         
-        response = None
-        while response is None:
-            status, response = request.next_chunk()
-            if status:
-                progress = int(status.progress() * 100)
-                logger.info(f"Upload progress: {progress}%")
+        # Serve chunks straight from a read-only mapping of the file instead of
+        # buffered read() copies for every chunk
+        mimetype = mimetypes.guess_type(video_path)[0] or 'video/*'
+        with open(video_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            media_file = googleapiclient.http.MediaIoBaseUpload(
+                mm, mimetype=mimetype, chunksize=_UPLOAD_CHUNK_SIZE, resumable=True)
+            
+            request = youtube.videos().insert(
+                part="snippet,status",
+                body=request_body,
+                media_body=media_file
+            )
+            
+            response = None
+            logged_decile = -1
+            while response is None:
+                status, response = request.next_chunk()
+                if status:
+                    progress = int(status.progress() * 100)
+                    # One line per 10% rather than per chunk
+                    if progress // 10 > logged_decile and logger.isEnabledFor(logging.INFO):
+                        logged_decile = progress // 10
+                        logger.info("Upload progress: %d%%", progress)
+                    if progress_cb:
+                        progress_cb(progress)
+        finally:
+            mm.close()
         
         video_id = response['id']
         video_url = f"https://www.youtube.com/watch?v={video_id}"
         
-        logger.info(f"Video uploaded successfully: {video_url}")
+        logger.info("Video uploaded successfully: %s", video_url)
         
         return {
             "success": True,
@@ -349,33 +469,6 @@ except Exception:
 import threading
 import time
 
-# Auto-provision credentials from environment (base64)
-try:
-    import base64
-    def _write_if_env_base64(env_key: str, dest_path: str) -> bool:
-        try:
-            b64 = os.environ.get(env_key)
-            if not b64:
-                return False
-            # Ensure destination directory exists
-            dest_dir = os.path.dirname(dest_path) or '.'
-            os.makedirs(dest_dir, exist_ok=True)
-            # Decode and write
-            with open(dest_path, 'wb') as f:
-                f.write(base64.b64decode(b64))
-            logger.info(f"Wrote credential from {env_key} to {dest_path}")
-            return True
-        except Exception as e:
-            logger.warning(f"Failed writing {dest_path} from {env_key}: {e}")
-            return False
-
-    # Write client secrets if provided
-    _write_if_env_base64('CLIENT_SECRETS_JSON_BASE64', os.path.join(os.getcwd(), 'client_secrets.json'))
-    # Write token into static so it persists on volume
-    _write_if_env_base64('YOUTUBE_TOKEN_JSON_BASE64', os.path.join('static', 'youtube_token.json'))
-except Exception:
-    pass
-
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -391,6 +484,32 @@ app.config['SESSION_TYPE'] = 'filesystem'
 app.config['SESSION_PERMANENT'] = False
 Session(app)
 
+# Serialize API responses with orjson when available
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class _ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson; unknown types go through Flask's default hook."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # jsonify(): hand orjson's bytes straight to the response instead of
+            # decoding to str for Flask to encode back to UTF-8
+            obj = self._prepare_response_obj(args, kwargs)
+            body = orjson.dumps(obj, default=self.default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            return self._app.response_class(body, mimetype=self.mimetype)
+
+    app.json = _ORJSONProvider(app)
+
+# Credentials are hydrated lazily on the first request instead of at import
+app.before_request(_hydrate_credentials_once)
+
 # Per-user storage helpers
 def get_session_user() -> dict:
     """Return current session user info or None."""
@@ -406,14 +525,23 @@ def get_session_user() -> dict:
 def get_user_base_dir(user_id: int) -> str:
     return os.path.join('static', 'users', str(user_id))
 
-def get_user_subdir(user_id: int, subdir: str) -> str:
+@functools.lru_cache(maxsize=1024)
+def _user_subdir(user_id: int, subdir: str) -> str:
+    # Directory is created on first use; later calls skip the join + makedirs stat
     path = os.path.join(get_user_base_dir(user_id), subdir)
     os.makedirs(path, exist_ok=True)
     return path
 
+def get_user_subdir(user_id: int, subdir: str) -> str:
+    return _user_subdir(user_id, subdir)
+
 # Create directories
+_CAPTIONS_DIR = 'captions'
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['DOWNLOAD_FOLDER'], exist_ok=True)
+os.makedirs(_CAPTIONS_DIR, exist_ok=True)
+# Reported by /api/health; the image ships these, so stat them once at boot
+_BOOT_DIRECTORIES = types.MappingProxyType({'static': os.path.exists('static')})
 
 # Register deferred OAuth routes now that app exists
 try:
@@ -425,6 +553,15 @@ except Exception:
 # Expand allowed file extensions
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'mp4', 'mov', 'm4a', 'avi', 'mkv', 'webm', 'flac', 'aac', 'ogg', 'txt', 'doc', 'docx', 'pdf'}
 ALLOWED_EXTENSIONS_EDIT = {'mp4', 'mov'}
+# Upload routing by suffix (dotted, lowercase, as returned by _file_ext)
+_MEDIA_VIDEO_EXTS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm'})
+_TEXT_DOC_EXTS = frozenset({'.txt', '.doc', '.docx', '.pdf'})
+
+def _file_ext(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()
+
+# Copy buffer for spooling uploads to disk (Werkzeug's default is 16 KiB)
+_UPLOAD_COPY_BUFSIZE = 1 << 20
 
 # Analytics helpers: YouTube data fetchers
 def _yt_service():
@@ -458,7 +595,7 @@ def _yt_service():
             return None
         
         token_uri = data.get('token_uri') or 'https://oauth2.googleapis.com/token'
-        scopes = data.get('scopes') or ['https://www.googleapis.com/auth/youtube.readonly']
+        scopes = data.get('scopes') or list(_YT_READ_SCOPES)
         
         creds = _OAuthCreds(
             token=token,
@@ -482,8 +619,7 @@ def _yt_service():
                     'scopes': scopes,
                     'expiry': getattr(creds, 'expiry', None).isoformat() if getattr(creds, 'expiry', None) else ''
                 }
-                with open(analytics_path, 'w') as f:
-                    json.dump(persist, f)
+                _write_json_safe(analytics_path, persist)
                 logger.info("Analytics token refreshed successfully")
             except Exception as e:
                 logger.warning(f"Analytics token refresh failed: {e}")
@@ -505,17 +641,45 @@ def _yt_service():
 # -------- Analytics Device Flow (for installed client in analytics.json) --------
 _DEVICE_STATE_PATH = os.path.join(os.getcwd(), 'analytics_device.json')
 
+# Shared keep-alive session for Google OAuth endpoints (device polling reuses TLS connections)
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset({'GET', 'POST'}))
+))
+
+# Parsed JSON keyed by path -> (st_mtime_ns, value); unchanged files cost one stat()
+_JSON_CACHE: dict[str, tuple] = {}
+_JSON_CACHE_LOCK = threading.Lock()
+
 def _read_json_safe(path: str):
     try:
-        with open(path, 'r') as f:
-            return json.load(f)
-    except Exception:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        with _JSON_CACHE_LOCK:
+            _JSON_CACHE.pop(path, None)
         return None
+    with _JSON_CACHE_LOCK:
+        cached = _JSON_CACHE.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                value = orjson.loads(f.read()) if orjson else json.load(f)
+        except Exception:
+            return None
+        _JSON_CACHE[path] = (mtime_ns, value)
+        return value
 
 def _write_json_safe(path: str, payload: dict):
     try:
-        with open(path, 'w') as f:
-            json.dump(payload, f)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(payload) if orjson else json.dumps(payload).encode('utf-8'))
+        # Don't rely on mtime granularity to notice our own write
+        with _JSON_CACHE_LOCK:
+            _JSON_CACHE.pop(path, None)
         return True
     except Exception as e:
         logger.warning(f"Failed to write {path}: {e}")
@@ -537,9 +701,8 @@ def api_analytics_device_start():
         client_secret = installed.get('client_secret')
         if not client_id or not client_secret:
             return jsonify({'success': False, 'message': 'client_id/client_secret missing in analytics.json'}), 400
-        scope = 'https://www.googleapis.com/auth/youtube.readonly'
-        import requests
-        r = requests.post('https://oauth2.googleapis.com/device/code', data={
+        scope = ' '.join(_YT_READ_SCOPES)
+        r = _HTTP.post('https://oauth2.googleapis.com/device/code', data={
             'client_id': client_id,
             'scope': scope
         })
@@ -556,6 +719,8 @@ def api_analytics_device_start():
             'expires_at': time.time() + int(data.get('expires_in', 1800))
         }
         _write_json_safe(_DEVICE_STATE_PATH, state)
+        _publish_device_result(state['device_code'], None)
+        Thread(target=_bg_poll_device, args=(state,), daemon=True).start()
         return jsonify({'success': True, 'verification_url': state['verification_url'], 'user_code': state['user_code']})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -566,8 +731,7 @@ def _device_poll_exchange():
         return {'success': False, 'ready': False, 'message': 'No device flow in progress'}
     if time.time() > state.get('expires_at', 0):
         return {'success': False, 'ready': False, 'expired': True, 'message': 'Device code expired'}
-    import requests
-    r = requests.post('https://oauth2.googleapis.com/token', data={
+    r = _HTTP.post('https://oauth2.googleapis.com/token', data={
         'client_id': state['client_id'],
         'client_secret': state['client_secret'],
         'device_code': state['device_code'],
@@ -582,10 +746,12 @@ def _device_poll_exchange():
             'token_uri': 'https://oauth2.googleapis.com/token',
             'client_id': state['client_id'],
             'client_secret': state['client_secret'],
-            'scopes': ['https://www.googleapis.com/auth/youtube.readonly'],
+            'scopes': list(_YT_READ_SCOPES),
             'expiry': ''
         }
         _write_json_safe(os.path.join(os.getcwd(), 'analytics.json'), persist)
+        # New account credentials: drop listings cached for the previous one
+        _list_channel_uploads_cached.cache_clear()
         try:
             os.remove(_DEVICE_STATE_PATH)
         except Exception:
@@ -599,20 +765,96 @@ def _device_poll_exchange():
         # authorization_pending or slow_down are expected while user authorizes
         return {'success': True, 'ready': False, 'error': err}
 
+# Latest outcome of the background device poller; status/stream read this instead of hitting Google
+_DEVICE_RESULT = {'device_code': None, 'result': None, 'seq': 0}
+_DEVICE_COND = threading.Condition()
+
+def _publish_device_result(device_code, result):
+    with _DEVICE_COND:
+        _DEVICE_RESULT.update(device_code=device_code, result=result, seq=_DEVICE_RESULT['seq'] + 1)
+        _DEVICE_COND.notify_all()
+
+def _bg_poll_device(state: dict):
+    """Poll Google's token endpoint at the advertised interval until the flow completes or expires."""
+    device_code = state['device_code']
+    interval = max(int(state.get('interval') or 5), 1)
+    while True:
+        time.sleep(interval)
+        if _DEVICE_RESULT['device_code'] != device_code:
+            return  # superseded by a newer device flow
+        try:
+            res = _device_poll_exchange()
+        except Exception as e:
+            logger.warning(f"Device flow poll failed: {e}")
+            continue
+        if res.get('error') == 'slow_down':
+            interval += 5
+        _publish_device_result(device_code, res)
+        if res.get('ready') or res.get('expired') or not res.get('success'):
+            return
+
 @app.route('/api/analytics/device/status', methods=['GET'])
 def api_analytics_device_status():
     try:
-        res = _device_poll_exchange()
+        res = _DEVICE_RESULT['result']
+        if res is None:
+            # No poller result yet (or server restarted mid-flow): ask Google directly
+            res = _device_poll_exchange()
         return jsonify(res)
     except Exception as e:
         return jsonify({'success': False, 'ready': False, 'message': str(e)}), 500
 
+@app.route('/api/analytics/device/stream', methods=['GET'])
+def api_analytics_device_stream():
+    """Server-sent events carrying each new device flow poll result."""
+    def generate():
+        seq = -1
+        while True:
+            with _DEVICE_COND:
+                if _DEVICE_RESULT['seq'] == seq:
+                    _DEVICE_COND.wait(timeout=15)
+                changed = _DEVICE_RESULT['seq'] != seq
+                seq = _DEVICE_RESULT['seq']
+                res = _DEVICE_RESULT['result']
+            if not changed or res is None:
+                yield ': keep-alive\n\n'
+                continue
+            yield f"data: {json.dumps(res)}\n\n"
+            if res.get('ready') or res.get('expired') or not res.get('success'):
+                return
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _video_record(v: dict) -> dict:
+    sn = v.get('snippet', {})
+    st = v.get('statistics', {})
+    cd = v.get('contentDetails', {})
+    return {
+        'id': v['id'],
+        'title': sn.get('title',''),
+        'description': sn.get('description',''),
+        'publishedAt': sn.get('publishedAt',''),
+        'channelTitle': sn.get('channelTitle',''),
+        'tags': sn.get('tags', []),
+        'categoryId': sn.get('categoryId',''),
+        'duration': cd.get('duration',''),
+        'dimension': cd.get('dimension',''),
+        'definition': cd.get('definition',''),
+        'viewCount': int(st.get('viewCount','0') or 0),
+        'likeCount': int(st.get('likeCount','0') or 0),
+        'commentCount': int(st.get('commentCount','0') or 0),
+        'favoriteCount': int(st.get('favoriteCount','0') or 0),
+        'thumbnail': (sn.get('thumbnails',{}).get('medium') or sn.get('thumbnails',{}).get('default') or {}).get('url',''),
+        'url': f"https://www.youtube.com/watch?v={v['id']}",
+    }
+
 def _list_channel_uploads(youtube, max_items: int | None = None):
-    # Get uploads playlist and list recent videos with statistics
+    # Get uploads playlist and list recent videos with statistics.
+    # Returns (videos, channel_meta, complete); complete is False when any videos.list part failed.
     try:
         ch_resp = youtube.channels().list(part="contentDetails,snippet,statistics", mine=True).execute()
         if not ch_resp.get('items'):
-            return [], {}
+            return [], {}, True
         channel = ch_resp['items'][0]
         uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
         channel_meta = {
@@ -624,67 +866,114 @@ def _list_channel_uploads(youtube, max_items: int | None = None):
             'subscriberCount': int(channel['statistics'].get('subscriberCount','0')),
             'videoCount': int(channel['statistics'].get('videoCount','0')),
         }
-        videos = []
+        # 1) Walk the uploads playlist collecting only video ids (cheap pages)
+        vid_ids = []
         next_page = None
-        # Fetch until no next page or until max_items reached (if provided)
-        fetched = 0
         hard_cap = max_items if (isinstance(max_items, int) and max_items > 0) else 1000
-        while True and fetched < hard_cap:
-            pl_items = youtube.playlistItems().list(part="contentDetails,snippet", playlistId=uploads_playlist_id, maxResults=50, pageToken=next_page).execute()
-            vid_ids = [it['contentDetails']['videoId'] for it in pl_items.get('items', [])]
-            if vid_ids:
-                stats_resp = youtube.videos().list(part="snippet,statistics,contentDetails", id=','.join(vid_ids)).execute()
-                for v in stats_resp.get('items', []):
-                    sn = v.get('snippet', {})
-                    st = v.get('statistics', {})
-                    cd = v.get('contentDetails', {})
-                    videos.append({
-                        'id': v['id'],
-                        'title': sn.get('title',''),
-                        'description': sn.get('description',''),
-                        'publishedAt': sn.get('publishedAt',''),
-                        'channelTitle': sn.get('channelTitle',''),
-                        'tags': sn.get('tags', []),
-                        'categoryId': sn.get('categoryId',''),
-                        'duration': cd.get('duration',''),
-                        'dimension': cd.get('dimension',''),
-                        'definition': cd.get('definition',''),
-                        'viewCount': int(st.get('viewCount','0') or 0),
-                        'likeCount': int(st.get('likeCount','0') or 0),
-                        'commentCount': int(st.get('commentCount','0') or 0),
-                        'favoriteCount': int(st.get('favoriteCount','0') or 0),
-                        'thumbnail': (sn.get('thumbnails',{}).get('medium') or sn.get('thumbnails',{}).get('default') or {}).get('url',''),
-                        'url': f"https://www.youtube.com/watch?v={v['id']}",
-                    })
-            fetched += len(vid_ids)
+        while len(vid_ids) < hard_cap:
+            pl_items = youtube.playlistItems().list(
+                part="contentDetails", playlistId=uploads_playlist_id, maxResults=50, pageToken=next_page,
+                fields="items/contentDetails/videoId,nextPageToken"
+            ).execute()
+            vid_ids.extend(it['contentDetails']['videoId'] for it in pl_items.get('items', []))
             next_page = pl_items.get('nextPageToken')
             if not next_page:
                 break
-        return videos, channel_meta
+
+        # 2) Fetch details for all id chunks in batched HTTP requests instead of one round trip each
+        chunks = [vid_ids[i:i + 50] for i in range(0, len(vid_ids), 50)]
+        responses = [None] * len(chunks)
+
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logger.warning("videos.list batch part %s failed: %s", request_id, exception)
+                return
+            responses[int(request_id)] = response
+
+        # The batch endpoint accepts at most 50 calls per HTTP request
+        for start in range(0, len(chunks), 50):
+            batch = youtube.new_batch_http_request(callback=_collect)
+            for idx in range(start, min(start + 50, len(chunks))):
+                batch.add(youtube.videos().list(part="snippet,statistics,contentDetails", id=','.join(chunks[idx])),
+                          request_id=str(idx))
+            batch.execute()
+
+        videos = []
+        for resp in responses:
+            if resp:
+                videos.extend(_video_record(v) for v in resp.get('items', []))
+        return videos, channel_meta, None not in responses
     except Exception as e:
         logger.error(f"YouTube analytics fetch error: {e}")
-        return [], {}
+        return [], {}, False
+
+def _ttl_cache(ttl: float = 120, cache_if=None):
+    """Memoize a function's result per positional args for ttl seconds.
+
+    cache_if, if given, decides whether a computed value is worth keeping (e.g. skip failures).
+    """
+    def decorator(fn):
+        entries = {}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = entries.get(args)
+            if hit and hit[0] > now:
+                return hit[1]
+            value = fn(*args)
+            if cache_if is None or cache_if(value):
+                with lock:
+                    entries[args] = (now + ttl, value)
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+# Only complete listings are kept; a failed videos.list part would otherwise be served for 120 s
+@_ttl_cache(ttl=120, cache_if=lambda res: bool(res and res[1] and res[2]))
+def _list_channel_uploads_cached(max_items):
+    """Channel uploads for the single analytics account; None when not authenticated."""
+    yt = _yt_service()
+    if not yt:
+        return None
+    return _list_channel_uploads(yt, max_items=max_items)
 
 @app.route('/api/analytics/videos')
 def api_analytics_videos():
     try:
-        yt = _yt_service()
-        if not yt:
+        try:
+            max_items = request.args.get('max', type=int)
+        except Exception:
+            max_items = None
+        listing = _list_channel_uploads_cached(max_items)
+        if listing is None:
             return jsonify({
                 'success': False, 
                 'message': 'YouTube analytics not authenticated',
                 'action_required': 'Use /api/analytics/device/start to begin authentication',
                 'status': 'needs_auth'
             }), 401
-        try:
-            max_items = request.args.get('max', type=int)
-        except Exception:
-            max_items = None
-        videos, channel = _list_channel_uploads(yt, max_items=max_items)
-        return jsonify({'success': True, 'channel': channel, 'videos': videos})
+        videos, channel, complete = listing
+        resp = jsonify({'success': True, 'channel': channel, 'videos': videos, 'complete': complete})
+        # Don't let browsers or proxies hold on to a listing with missing videos
+        resp.headers['Cache-Control'] = 'public, max-age=60' if complete else 'no-store'
+        return resp
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# 10 pages x 100 threads; partial response trims everything the view doesn't render
+_YT_COMMENT_MAX_PAGES = 10
+_YT_COMMENT_FIELDS = ('nextPageToken,items/snippet/topLevelComment/snippet'
+                      '(authorDisplayName,textDisplay,likeCount,publishedAt,updatedAt)')
+
 @app.route('/api/analytics/comments')
 def api_analytics_comments():
     try:
@@ -701,12 +990,11 @@ def api_analytics_comments():
             }), 401
         comments = []
         page = None
-        total = 0
-        while True and total < 1000:  # cap for responsiveness
-            resp = yt.commentThreads().list(part="snippet", videoId=video_id, maxResults=100, pageToken=page, order='relevance').execute()
+        for _ in range(_YT_COMMENT_MAX_PAGES):  # cap for responsiveness
+            resp = yt.commentThreads().list(part="snippet", videoId=video_id, maxResults=100, pageToken=page,
+                                            order='relevance', fields=_YT_COMMENT_FIELDS).execute()
             for it in resp.get('items', []):
-                sn = it['snippet']
-                top = sn['topLevelComment']['snippet']
+                top = it['snippet']['topLevelComment']['snippet']
                 comments.append({
                     'author': top.get('authorDisplayName',''),
                     'text': top.get('textDisplay',''),
@@ -714,7 +1002,6 @@ def api_analytics_comments():
                     'publishedAt': top.get('publishedAt',''),
                     'updatedAt': top.get('updatedAt','')
                 })
-            total += len(resp.get('items', []))
             page = resp.get('nextPageToken')
             if not page:
                 break
@@ -750,110 +1037,232 @@ if database_url:
     except Exception as e:
         logger.warning(f"Failed to parse DATABASE_URL, falling back to config: {e}")
 logger.info(f"Database config: {db_config}")
+
+# Shared connection pool, opened on first use so the app still boots when Postgres is down
+_PG_POOL = None
+_PG_POOL_LOCK = threading.Lock()
+_PG_POOL_MAX = 16
+# getconn() raises PoolError when exhausted instead of blocking; this makes callers queue
+_PG_POOL_SLOTS = threading.BoundedSemaphore(_PG_POOL_MAX)
+_PG_POOL_WAIT = 10
+
+def _get_pg_pool():
+    global _PG_POOL
+    if _PG_POOL is None:
+        with _PG_POOL_LOCK:
+            if _PG_POOL is None:
+                _PG_POOL = psycopg2.pool.ThreadedConnectionPool(1, _PG_POOL_MAX, **db_config)
+    return _PG_POOL
+
+@contextmanager
+def pg_conn():
+    """Borrow a pooled connection; it goes back with no open transaction and autocommit off.
+
+    Waits up to _PG_POOL_WAIT seconds for a free slot, then falls back to a one-off connection."""
+    if not _PG_POOL_SLOTS.acquire(timeout=_PG_POOL_WAIT):
+        logger.warning("Postgres pool exhausted; opening a direct connection")
+        conn = psycopg2.connect(**db_config)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    try:
+        pool = _get_pg_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            discard = bool(conn.closed)
+            if not discard:
+                try:
+                    if not conn.autocommit:
+                        conn.rollback()
+                    conn.autocommit = False
+                except psycopg2.Error:
+                    discard = True
+            pool.putconn(conn, close=discard)
+    finally:
+        _PG_POOL_SLOTS.release()
 # In-memory scheduler storage (simple file-backed persistence)
 SCHEDULE_FILE = 'scheduled_posts.json'
 
+class ScheduleLoadError(RuntimeError):
+    """SCHEDULE_FILE exists but can't be read or parsed (as opposed to there being no jobs)."""
+
+# (mtime_ns, job list or ScheduleLoadError) for the last version of SCHEDULE_FILE read
+_SCHEDULE_CACHE = None
+_SCHEDULE_CACHE_LOCK = threading.Lock()
+
 def _load_schedules():
+    """Job dicts from SCHEDULE_FILE, [] when it doesn't exist; raises ScheduleLoadError when unreadable."""
+    global _SCHEDULE_CACHE
     try:
-        if os.path.exists(SCHEDULE_FILE):
-            with open(SCHEDULE_FILE, 'r') as f:
-                return json.load(f)
-    except Exception as e:
-        logging.warning(f"Failed to load schedules: {e}")
-    return []
+        mtime_ns = os.stat(SCHEDULE_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        raise ScheduleLoadError(f"Failed to load schedules: {e}") from e
+    with _SCHEDULE_CACHE_LOCK:
+        # Parsed once per file change; a broken version is logged once, then re-raised from the cache
+        if _SCHEDULE_CACHE is None or _SCHEDULE_CACHE[0] != mtime_ns:
+            try:
+                with open(SCHEDULE_FILE, 'rb') as f:
+                    schedules = orjson.loads(f.read()) if orjson else json.load(f)
+                if not isinstance(schedules, list):
+                    raise ValueError(f"expected a list of jobs, got {type(schedules).__name__}")
+            except Exception as e:
+                schedules = ScheduleLoadError(f"Failed to load schedules: {e}")
+                logging.error(str(schedules))
+            _SCHEDULE_CACHE = (mtime_ns, schedules)
+        schedules = _SCHEDULE_CACHE[1]
+    if isinstance(schedules, ScheduleLoadError):
+        raise schedules
+    # Callers get their own job dicts to mutate
+    return [dict(job) for job in schedules]
 
 def _save_schedules(schedules):
+    global _SCHEDULE_CACHE
+    # Write a temp file and swap it in, so a crash mid-write never truncates the schedule
+    tmp = f"{SCHEDULE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(SCHEDULE_FILE, 'w') as f:
+        with open(tmp, 'w') as f:
             json.dump(schedules, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, SCHEDULE_FILE)
     except Exception as e:
         logging.error(f"Failed to save schedules: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    with _SCHEDULE_CACHE_LOCK:
+        _SCHEDULE_CACHE = None
+    _wake_scheduler()
+
+# The scheduler's event loop sleeps until the next job is due; any change to the schedule file wakes it early
+_SCHED_LOOP = None
+_SCHED_WAKE = None  # asyncio.Event owned by _SCHED_LOOP
+_SCHED_MAX_SLEEP = 300  # re-read periodically in case the file is edited out of band
+_SCHED_MAX_CONCURRENCY = 4
+
+def _wake_scheduler():
+    loop, wake = _SCHED_LOOP, _SCHED_WAKE
+    if loop is not None and wake is not None:
+        loop.call_soon_threadsafe(wake.set)
 
 def _current_local_ts():
     # Use local time consistently with naive fromisoformat parsing
     return datetime.now().timestamp()
 
+@functools.lru_cache(maxsize=4096)
 def _parse_iso(dt_str: str) -> float:
     try:
         return datetime.fromisoformat(dt_str).timestamp()
     except Exception:
         return 0.0
 
-def _scheduler_loop(app):
+def _resolve_user_video(user_id: int, video_path: str) -> str:
+    """Prefer the user's trimmed copy of a scheduled video, falling back to the stored path."""
+    candidate = os.path.join(get_user_subdir(user_id, 'trimmed'), os.path.basename(video_path))
+    return candidate if os.path.exists(candidate) else video_path
+
+def _run_scheduled_job(job: dict) -> dict:
+    """Blocking part of a scheduled post (runs on the upload pool); returns the fields to update."""
     with app.app_context():
-        while True:
+        user_id = job['user_id']
+        video_path = job['video_path']
+        title = job.get('title') or os.path.basename(video_path)
+        description = job.get('description', '')
+        tags = job.get('tags', [])
+        privacy = job.get('privacy', 'public')
+
+        resolved = _resolve_user_video(user_id, video_path)
+        result = upload_video_simple(resolved, title, description, tags, privacy)
+        if result.get('success'):
+            save_upload_record(user_id, video_path, result)
+            return {'status': 'uploaded'}
+        return {'status': 'failed', 'error': result.get('error')}
+
+async def _execute_scheduled(job: dict, sem: asyncio.Semaphore, running: dict):
+    try:
+        async with sem:
             try:
-                schedules = _load_schedules()
-                now_ts = _current_local_ts()
-                pending = []
-                for job in schedules:
-                    if job.get('status') == 'pending' and _parse_iso(job.get('run_at_iso', '')) <= now_ts:
-                        # Execute upload for the user
-                        try:
-                            user_id = job['user_id']
-                            video_path = job['video_path']
-                            title = job.get('title') or os.path.basename(video_path)
-                            description = job.get('description', '')
-                            tags = job.get('tags', [])
-                            privacy = job.get('privacy', 'public')
-
-                            # Resolve per-user path
-                            user_trimmed = get_user_subdir(user_id, 'trimmed')
-                            candidate = os.path.join(user_trimmed, os.path.basename(video_path))
-                            resolved = candidate if os.path.exists(candidate) else video_path
-
-                            result = upload_video_simple(resolved, title, description, tags, privacy)
-                            if result.get('success'):
-                                job['status'] = 'uploaded'
-                                save_upload_record(user_id, video_path, result)
-                                # Also mark uploaded in uploads file for dashboard
-                                try:
-                                    uploads = []
-                                    if os.path.exists('youtube_uploads.json'):
-                                        with open('youtube_uploads.json', 'r') as f:
-                                            uploads = json.load(f)
-                                    uploads.append({
-                                        'user_id': user_id,
-                                        'video_path': video_path,
-                                        'filename': os.path.basename(video_path),
-                                        'youtube_id': result.get('video_id'),
-                                        'youtube_url': result.get('video_url'),
-                                        'title': result.get('title'),
-                                        'upload_time': result.get('upload_time'),
-                                        'status': 'uploaded'
-                                    })
-                                    with open('youtube_uploads.json', 'w') as f:
-                                        json.dump(uploads, f, indent=2)
-                                except Exception:
-                                    pass
-                            else:
-                                job['status'] = 'failed'
-                                job['error'] = result.get('error')
-                        except Exception as e:
-                            job['status'] = 'failed'
-                            job['error'] = str(e)
-                        pending.append(job)
-                    else:
-                        pending.append(job)
-                _save_schedules(pending)
+                updates = await asyncio.get_running_loop().run_in_executor(_UPLOAD_POOL, _run_scheduled_job, job)
             except Exception as e:
-                logging.error(f"Scheduler loop error: {e}")
-            _time.sleep(15)
+                updates = {'status': 'failed', 'error': str(e)}
+        # Re-read so edits made while the upload ran are not clobbered
+        schedules = _load_schedules()
+        for j in schedules:
+            if j.get('id') == job.get('id'):
+                j.update(updates)
+        _save_schedules(schedules)
+    except Exception as e:
+        logging.error(f"Scheduled job {job.get('id')} error: {e}")
+    finally:
+        running.pop(job.get('id'), None)
+
+@functools.lru_cache(maxsize=16)
+def _log_scheduler_error_once(kind: str, message: str):
+    # Repeats of the same failure are suppressed until the loop recovers (cache_clear)
+    logging.error(f"Scheduler loop error ({kind}): {message}")
+
+async def _scheduler_main():
+    global _SCHED_LOOP, _SCHED_WAKE
+    _SCHED_LOOP = asyncio.get_running_loop()
+    _SCHED_WAKE = asyncio.Event()
+    sem = asyncio.Semaphore(_SCHED_MAX_CONCURRENCY)
+    running = {}  # job id -> task, also keeps tasks referenced
+    fail_count = 0
+    while True:
+        _SCHED_WAKE.clear()
+        next_due = None
+        try:
+            now_ts = _current_local_ts()
+            for job in _load_schedules():
+                if job.get('status') != 'pending' or job.get('id') in running:
+                    continue
+                run_at = job.get('run_at_ts')
+                if run_at is None:
+                    # Jobs scheduled before run_at_ts was stored
+                    run_at = _parse_iso(job.get('run_at_iso', ''))
+                if run_at > now_ts:
+                    next_due = run_at if next_due is None else min(next_due, run_at)
+                else:
+                    running[job.get('id')] = asyncio.create_task(_execute_scheduled(job, sem, running))
+            if fail_count:
+                fail_count = 0
+                _log_scheduler_error_once.cache_clear()
+        except Exception as e:
+            fail_count += 1
+            if not isinstance(e, ScheduleLoadError):
+                # _load_schedules already logged this file version once
+                _log_scheduler_error_once(type(e).__name__, str(e))
+        timeout = _SCHED_MAX_SLEEP
+        if fail_count:
+            # Exponential backoff with jitter while the schedule can't be processed
+            timeout = min(_SCHED_MAX_SLEEP, 15 * 2 ** fail_count) + random.uniform(0, 1)
+        elif next_due is not None:
+            timeout = min(max(next_due - _current_local_ts(), 0), _SCHED_MAX_SLEEP)
+        try:
+            await asyncio.wait_for(_SCHED_WAKE.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
 def start_scheduler():
-    t = Thread(target=_scheduler_loop, args=(app,), daemon=True)
+    t = Thread(target=asyncio.run, args=(_scheduler_main(),), daemon=True, name='scheduler')
     t.start()
 
 # Check database connection
 def check_db_connection():
     try:
-        conn = psycopg2.connect(**db_config)
-        conn.autocommit = True  # Set autocommit after connection
-        cursor = conn.cursor()
-        cursor.execute("SELECT current_database();")
-        db_name = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
+        with pg_conn() as conn:
+            conn.autocommit = True  # Set autocommit after connection
+            cursor = conn.cursor()
+            cursor.execute("SELECT current_database();")
+            db_name = cursor.fetchone()[0]
+            cursor.close()
         logger.info(f"Connected to database: {db_name}")
         return {'status': 'success', 'message': f'Database connected successfully: {db_name}'}
     except psycopg2.Error as e:
@@ -863,38 +1272,34 @@ def check_db_connection():
 # Ensure required tables exist
 def initialize_database_schema():
     try:
-        conn = psycopg2.connect(**db_config)
-        conn.autocommit = True
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                username VARCHAR(50) UNIQUE NOT NULL,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL DEFAULT NOW()
-            );
-            """
-        )
+        with pg_conn() as conn:
+            conn.autocommit = True
+            cursor = conn.cursor()
+
+            # One round trip for the whole schema
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id SERIAL PRIMARY KEY,
+                    username VARCHAR(50) UNIQUE NOT NULL,
+                    email VARCHAR(255) UNIQUE NOT NULL,
+                    password TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+                );
+
+                CREATE TABLE IF NOT EXISTS password_resets (
+                    id SERIAL PRIMARY KEY,
+                    email VARCHAR(255) NOT NULL,
+                    token VARCHAR(255) UNIQUE NOT NULL,
+                    expires_at TIMESTAMP NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_password_resets_email ON password_resets (email);
+                """
+            )
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS password_resets (
-                id SERIAL PRIMARY KEY,
-                email VARCHAR(255) NOT NULL,
-                token VARCHAR(255) UNIQUE NOT NULL,
-                expires_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP NOT NULL DEFAULT NOW()
-            );
-            """
-        )
-
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_password_resets_email ON password_resets (email);")
-
-        cursor.close()
-        conn.close()
+            cursor.close()
         logger.info("Database schema ensured (users, password_resets)")
         return True
     except Exception as e:
@@ -907,25 +1312,40 @@ if not google_api_key:
     logger.error("GOOGLE_API_KEY is not set in configuration")
     raise ValueError("GOOGLE_API_KEY must be set in config.py")
 
-genai.configure(api_key=google_api_key)
+# gRPC (the SDK default) keeps one long-lived HTTP/2 channel that every request multiplexes over
+genai.configure(api_key=google_api_key, transport='grpc')
 model = genai.GenerativeModel('gemini-1.5-flash')
 
 # Initialize Whisper model lazily to reduce memory at boot (especially on Fly)
 whisper_model = None
+_WHISPER_MODEL_SIZE = "tiny"
+_WHISPER_BACKEND = None  # 'faster_whisper' (CTranslate2 int8) or 'openai_whisper'
 whisper_edit_model = None
 
 def get_whisper_model():
     """Load Whisper model on first use unless disabled via env var."""
-    global whisper_model
+    global whisper_model, _WHISPER_BACKEND
     if whisper_model is not None:
         return whisper_model
-    if os.environ.get('WHISPER_DISABLED', 'false').lower() == 'true':
+    if (_ENV['WHISPER_DISABLED'] or 'false').lower() == 'true':
         logger.warning("Whisper is disabled via WHISPER_DISABLED env var")
         return None
+    # Prefer faster-whisper: int8 on CPU is several times faster and about half the memory
+    try:
+        from faster_whisper import WhisperModel
+        whisper_model = WhisperModel(_WHISPER_MODEL_SIZE, device="cpu", compute_type="int8")
+        _WHISPER_BACKEND = 'faster_whisper'
+        logger.info(f"Whisper AI model loaded successfully ({_WHISPER_MODEL_SIZE}, faster-whisper int8)")
+        return whisper_model
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.warning(f"faster-whisper failed to load, trying openai-whisper: {e}")
     try:
         import whisper
-        whisper_model_local = whisper.load_model("tiny")
+        whisper_model_local = whisper.load_model(_WHISPER_MODEL_SIZE)
         whisper_model = whisper_model_local
+        _WHISPER_BACKEND = 'openai_whisper'
         logger.info("Whisper AI model loaded successfully (tiny model)")
     except ImportError:
         logger.warning("Whisper library not installed. Install with: pip install openai-whisper")
@@ -938,10 +1358,73 @@ def get_whisper_model():
 # Initialize translator
 translator = None # Removed googletrans import, so translator is no longer available
 
+# Whisper results keyed by sha256 of the source file + model size: in memory, then on disk
+_TRANSCRIPT_CACHE_DIR = _ENV['TRANSCRIPT_CACHE_DIR'] or os.path.join('output', 'transcripts')
+_TRANSCRIPT_CACHE_MAX_BYTES = 500 * 1024 * 1024
+_TRANSCRIPT_MEMO: dict[str, dict] = {}
+_TRANSCRIPT_MEMO_SIZE = 64
+_TRANSCRIPT_MEMO_LOCK = threading.Lock()
+
+def _transcript_cache_key(path: str) -> str | None:
+    try:
+        if os.path.getsize(path) > _TRANSCRIPT_CACHE_MAX_BYTES:
+            return None
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(chunk)
+        return f"{h.hexdigest()}-{_WHISPER_MODEL_SIZE}"
+    except OSError:
+        return None
+
+def _transcript_cache_get(key: str | None):
+    if not key:
+        return None
+    hit = _TRANSCRIPT_MEMO.get(key)
+    if hit is None:
+        # Read directly rather than via _read_json_safe: its cache is unbounded, only the memo is capped
+        try:
+            with open(os.path.join(_TRANSCRIPT_CACHE_DIR, key + '.json'), 'rb') as f:
+                hit = orjson.loads(f.read()) if orjson else json.load(f)
+        except (OSError, ValueError):
+            hit = None
+        if isinstance(hit, dict):
+            _transcript_memo_put(key, hit)
+        else:
+            hit = None
+    return dict(hit) if hit else None
+
+def _transcript_memo_put(key: str, result: dict):
+    with _TRANSCRIPT_MEMO_LOCK:
+        _TRANSCRIPT_MEMO[key] = result
+        while len(_TRANSCRIPT_MEMO) > _TRANSCRIPT_MEMO_SIZE:
+            _TRANSCRIPT_MEMO.pop(next(iter(_TRANSCRIPT_MEMO)))
+
+def _transcript_cache_put(key: str | None, result: dict):
+    # Only Whisper output is deterministic enough to reuse; fallbacks may succeed on retry
+    if not key or not result.get('success') or result.get('method') != 'whisper_ai':
+        return
+    _transcript_memo_put(key, result)
+    try:
+        os.makedirs(_TRANSCRIPT_CACHE_DIR, exist_ok=True)
+        dest = os.path.join(_TRANSCRIPT_CACHE_DIR, key + '.json')
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp, dest)
+    except Exception as e:
+        logger.warning(f"Failed to cache transcript: {e}")
+
 # Add transcript generation functionality using Whisper AI
 def generate_transcript_from_video(video_path):
     """Generate transcript from video using Whisper AI"""
     try:
+        cache_key = _transcript_cache_key(video_path)
+        cached = _transcript_cache_get(cache_key)
+        if cached:
+            logger.info(f"Using cached transcript for: {video_path}")
+            return cached
+
         model = get_whisper_model()
         if not model:
             return {
@@ -949,13 +1432,35 @@ def generate_transcript_from_video(video_path):
                 'error': 'Whisper AI model not available. Please install openai-whisper library.'
             }
         
-        # Extract audio from video using ffmpeg
-        audio_path = video_path.replace('.mp4', '.wav').replace('.mov', '.wav').replace('.avi', '.wav').replace('.mkv', '.wav').replace('.webm', '.wav')
-        
-        # Use ffmpeg to extract audio
+        # Decode audio straight into memory: 16 kHz mono float32 is what Whisper consumes
         import subprocess
         try:
             logger.info(f"Extracting audio from video: {video_path}")
+            proc = subprocess.run([
+                'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', video_path,
+                '-vn', '-f', 's16le', '-acodec', 'pcm_s16le',
+                '-ar', '16000', '-ac', '1', '-'
+            ], check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg error: {str(e)}")
+            return {
+                'success': False,
+                'error': f'Failed to extract audio from video: {str(e)}'
+            }
+        try:
+            import numpy as np
+            audio = np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+            result = _whisper_transcript(model, audio)
+            if result:
+                _transcript_cache_put(cache_key, result)
+                return result
+        except Exception as whisper_error:
+            logger.warning(f"Whisper AI failed on decoded audio, trying WAV fallback: {whisper_error}")
+
+        # Fallback recognizers need a WAV file on disk
+        audio_path = video_path.replace('.mp4', '.wav').replace('.mov', '.wav').replace('.avi', '.wav').replace('.mkv', '.wav').replace('.webm', '.wav')
+        
+        try:
             subprocess.run([
                 'ffmpeg', '-i', video_path, 
                 '-vn', '-acodec', 'pcm_s16le', 
@@ -964,7 +1469,8 @@ def generate_transcript_from_video(video_path):
             ], check=True, capture_output=True)
             
             # Now generate transcript from audio using Whisper
-            result = generate_transcript_from_audio(audio_path)
+            result = _transcribe_audio_file(audio_path)
+            _transcript_cache_put(cache_key, result)
             
             # Clean up temporary audio file
             if os.path.exists(audio_path):
@@ -988,34 +1494,59 @@ def generate_transcript_from_video(video_path):
 
 def generate_transcript_from_audio(audio_path):
     """Generate transcript from audio file using Whisper AI or fallback methods"""
+    cache_key = _transcript_cache_key(audio_path)
+    cached = _transcript_cache_get(cache_key)
+    if cached:
+        logger.info(f"Using cached transcript for: {audio_path}")
+        return cached
+    result = _transcribe_audio_file(audio_path)
+    _transcript_cache_put(cache_key, result)
+    return result
+
+def _whisper_transcript(model, audio):
+    """Run Whisper on a file path or 16 kHz float32 array; None if it produced no text."""
+    if _WHISPER_BACKEND == 'faster_whisper':
+        segments, info = model.transcribe(audio, beam_size=1)
+        result = {
+            'text': ''.join(seg.text for seg in segments),
+            'language': info.language,
+            'segments': [{'end': info.duration}],
+        }
+    else:
+        result = model.transcribe(audio)
+    
+    if result and 'text' in result:
+        transcript = result['text'].strip()
+        word_count = len(transcript.split())
+        
+        # Get audio duration from Whisper result
+        if 'segments' in result and result['segments']:
+            duration_seconds = result['segments'][-1]['end']
+            duration = f"{int(duration_seconds//60):02d}:{int(duration_seconds%60):02d}"
+        else:
+            duration = "00:00:00"
+        
+        logger.info(f"Whisper AI successfully generated transcript with {word_count} words")
+        return {
+            'success': True,
+            'transcript': transcript,
+            'word_count': word_count,
+            'duration': duration,
+            'language': result.get('language', 'unknown'),
+            'method': 'whisper_ai'
+        }
+    return None
+
+def _transcribe_audio_file(audio_path):
     try:
         # Try Whisper AI first
         model = get_whisper_model()
         if model:
             logger.info(f"Using Whisper AI for transcription: {audio_path}")
             try:
-                result = model.transcribe(audio_path)
-                
-                if result and 'text' in result:
-                    transcript = result['text'].strip()
-                    word_count = len(transcript.split())
-                    
-                    # Get audio duration from Whisper result
-                    if 'segments' in result and result['segments']:
-                        duration_seconds = result['segments'][-1]['end']
-                        duration = f"{int(duration_seconds//60):02d}:{int(duration_seconds%60):02d}"
-                    else:
-                        duration = "00:00:00"
-                    
-                    logger.info(f"Whisper AI successfully generated transcript with {word_count} words")
-                    return {
-                        'success': True,
-                        'transcript': transcript,
-                        'word_count': word_count,
-                        'duration': duration,
-                        'language': result.get('language', 'unknown'),
-                        'method': 'whisper_ai'
-                    }
+                result = _whisper_transcript(model, audio_path)
+                if result:
+                    return result
             except Exception as whisper_error:
                 logger.warning(f"Whisper AI failed, trying fallback: {whisper_error}")
         
@@ -1090,24 +1621,96 @@ def generate_transcript_from_audio(audio_path):
             'method': 'error'
         }
 
+# Transcription runs in worker processes so Whisper doesn't hold the GIL against request threads.
+# Each worker loads the model once via the initializer; the pool is created on first use.
+_TRANSCRIBE_POOL = None
+_TRANSCRIBE_POOL_LOCK = threading.Lock()
+# Seconds to wait for one file; unset means no cap, since long videos legitimately take a while
+_TRANSCRIBE_TIMEOUT = float(_ENV['TRANSCRIBE_TIMEOUT'] or 0) or None
+
+def _get_transcribe_pool():
+    global _TRANSCRIBE_POOL
+    with _TRANSCRIBE_POOL_LOCK:
+        if _TRANSCRIBE_POOL is None:
+            # Never fork: by now the scheduler, executor and gRPC threads hold locks a child would inherit
+            _TRANSCRIBE_POOL = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max(1, (os.cpu_count() or 2) // 2), initializer=get_whisper_model,
+                mp_context=multiprocessing.get_context('forkserver'))
+        return _TRANSCRIBE_POOL
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _release_upload(future, path: str):
+    """Drop a job's upload: now if it never started, else once the worker is done reading it."""
+    if future is None or future.cancel() or future.done():
+        _remove_quietly(path)
+    else:
+        # A running process can't be interrupted
+        future.add_done_callback(lambda _f: _remove_quietly(path))
+
+def _submit_transcription(fn, path):
+    """Queue fn(path) on the worker pool; None when the pool is broken (run it inline instead)."""
+    global _TRANSCRIBE_POOL
+    try:
+        return _get_transcribe_pool().submit(fn, path)
+    except concurrent.futures.process.BrokenProcessPool as e:
+        logger.warning(f"Transcription pool failed, running inline: {e}")
+        with _TRANSCRIBE_POOL_LOCK:
+            _TRANSCRIBE_POOL = None
+        return None
+
+def _finish_transcription(future, fn, path):
+    """Wait for a submitted job (inline if the pool died). Takes ownership of the upload at `path`."""
+    global _TRANSCRIBE_POOL
+    try:
+        if future is not None:
+            try:
+                return future.result(timeout=_TRANSCRIBE_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                logger.warning(f"Transcription of {path} timed out after {_TRANSCRIBE_TIMEOUT:g}s")
+                return {
+                    'success': False,
+                    'error': f'Transcription timed out after {_TRANSCRIBE_TIMEOUT:g} seconds',
+                    'method': 'timeout'
+                }
+            except concurrent.futures.process.BrokenProcessPool as e:
+                logger.warning(f"Transcription pool failed, running inline: {e}")
+                with _TRANSCRIBE_POOL_LOCK:
+                    _TRANSCRIBE_POOL = None
+        return fn(path)
+    finally:
+        _release_upload(future, path)
+
+def _run_transcription(fn, path):
+    return _finish_transcription(_submit_transcription(fn, path), fn, path)
+
 def process_text_file(file_path):
     """Process text files and extract content"""
     try:
         file_extension = os.path.splitext(file_path)[1].lower()
         
         if file_extension == '.txt':
-            # Simple text file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Simple text file: decode straight out of the page cache, no intermediate bytes copy
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    content = ''
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # Strict like text-mode open(); invalid UTF-8 is reported as an error
+                        content = str(mm, 'utf-8')
+                # Universal newlines, as text-mode reading did
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
         elif file_extension == '.pdf':
             # PDF file - would need PyPDF2 or similar
             try:
                 import PyPDF2
                 with open(file_path, 'rb') as f:
                     pdf_reader = PyPDF2.PdfReader(f)
-                    content = ""
-                    for page in pdf_reader.pages:
-                        content += page.extract_text() + "\n"
+                    content = "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
             except ImportError:
                 return {
                     'success': False,
@@ -1118,9 +1721,7 @@ def process_text_file(file_path):
             try:
                 from docx import Document
                 doc = Document(file_path)
-                content = ""
-                for paragraph in doc.paragraphs:
-                    content += paragraph.text + "\n"
+                content = "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
             except ImportError:
                 return {
                     'success': False,
@@ -1158,118 +1759,12 @@ def process_text_file(file_path):
         }
 
 # Supported languages
-LANGUAGES = {
-    'en': {'name': 'English', 'flag': '🇬🇧'},
-    'es': {'name': 'Spanish', 'flag': '🇪🇸'},
-    'fr': {'name': 'French', 'flag': '🇫🇷'},
-    'de': {'name': 'German', 'flag': '🇩🇪'},
-    'it': {'name': 'Italian', 'flag': '🇮🇹'},
-    'pt': {'name': 'Portuguese', 'flag': '🇵🇹'},
-    'ru': {'name': 'Russian', 'flag': '🇷🇺'},
-    'ja': {'name': 'Japanese', 'flag': '🇯🇵'},
-    'ko': {'name': 'Korean', 'flag': '🇰🇷'},
-    'zh': {'name': 'Chinese', 'flag': '🇨🇳'},
-    'ar': {'name': 'Arabic', 'flag': '🇸🇦'},
-    'hi': {'name': 'Hindi', 'flag': '🇮🇳'},
-    'tr': {'name': 'Turkish', 'flag': '🇹🇷'},
-    'nl': {'name': 'Dutch', 'flag': '🇳🇱'},
-    'pl': {'name': 'Polish', 'flag': '🇵🇱'},
-    'sv': {'name': 'Swedish', 'flag': '🇸🇪'},
-    'da': {'name': 'Danish', 'flag': '🇩🇰'},
-    'no': {'name': 'Norwegian', 'flag': '🇳🇴'},
-    'fi': {'name': 'Finnish', 'flag': '🇫🇮'},
-    'cs': {'name': 'Czech', 'flag': '🇨🇿'},
-    'hu': {'name': 'Hungarian', 'flag': '🇭🇺'},
-    'ro': {'name': 'Romanian', 'flag': '🇷🇴'},
-    'bg': {'name': 'Bulgarian', 'flag': '🇧🇬'},
-    'hr': {'name': 'Croatian', 'flag': '🇭🇷'},
-    'sk': {'name': 'Slovak', 'flag': '🇸🇰'},
-    'sl': {'name': 'Slovenian', 'flag': '🇸🇮'},
-    'et': {'name': 'Estonian', 'flag': '🇪🇪'},
-    'lv': {'name': 'Latvian', 'flag': '🇱🇻'},
-    'lt': {'name': 'Lithuanian', 'flag': '🇱🇹'},
-    'mt': {'name': 'Maltese', 'flag': '🇲🇹'},
-    'el': {'name': 'Greek', 'flag': '🇬🇷'},
-    'he': {'name': 'Hebrew', 'flag': '🇮🇱'},
-    'th': {'name': 'Thai', 'flag': '🇹🇭'},
-    'vi': {'name': 'Vietnamese', 'flag': '🇻🇳'},
-    'id': {'name': 'Indonesian', 'flag': '🇮🇩'},
-    'ms': {'name': 'Malay', 'flag': '🇲🇾'},
-    'tl': {'name': 'Filipino', 'flag': '🇵🇭'},
-    'uk': {'name': 'Ukrainian', 'flag': '🇺🇦'},
-    'be': {'name': 'Belarusian', 'flag': '🇧🇾'},
-    'mk': {'name': 'Macedonian', 'flag': '🇲🇰'},
-    'sq': {'name': 'Albanian', 'flag': '🇦🇱'},
-    'ka': {'name': 'Georgian', 'flag': '🇬🇪'},
-    'hy': {'name': 'Armenian', 'flag': '🇦🇲'},
-    'az': {'name': 'Azerbaijani', 'flag': '🇦🇿'},
-    'kk': {'name': 'Kazakh', 'flag': '🇰🇿'},
-    'ky': {'name': 'Kyrgyz', 'flag': '🇰🇬'},
-    'uz': {'name': 'Uzbek', 'flag': '🇺🇿'},
-    'tg': {'name': 'Tajik', 'flag': '🇹🇯'},
-    'mn': {'name': 'Mongolian', 'flag': '🇲🇳'},
-    'ne': {'name': 'Nepali', 'flag': '🇳🇵'},
-    'si': {'name': 'Sinhala', 'flag': '🇱🇰'},
-    'my': {'name': 'Burmese', 'flag': '🇲🇲'},
-    'km': {'name': 'Khmer', 'flag': '🇰🇭'},
-    'lo': {'name': 'Lao', 'flag': '🇱🇦'},
-    'gl': {'name': 'Galician', 'flag': '🇪🇸'},
-    'eu': {'name': 'Basque', 'flag': '🇪🇸'},
-    'ca': {'name': 'Catalan', 'flag': '🇪🇸'},
-    'cy': {'name': 'Welsh', 'flag': '🇬🇧'},
-    'ga': {'name': 'Irish', 'flag': '🇮🇪'},
-    'gd': {'name': 'Scottish Gaelic', 'flag': '🇬🇧'},
-    'is': {'name': 'Icelandic', 'flag': '🇮🇸'},
-    'fo': {'name': 'Faroese', 'flag': '🇫🇴'},
-    'fy': {'name': 'Frisian', 'flag': '🇳🇱'},
-    'lb': {'name': 'Luxembourgish', 'flag': '🇱🇺'},
-    'rm': {'name': 'Romansh', 'flag': '🇨🇭'},
-    'wa': {'name': 'Walloon', 'flag': '🇧🇪'},
-    'fur': {'name': 'Friulian', 'flag': '🇮🇹'},
-    'sc': {'name': 'Sardinian', 'flag': '🇮🇹'},
-    'vec': {'name': 'Venetian', 'flag': '🇮🇹'},
-    'lmo': {'name': 'Lombard', 'flag': '🇮🇹'},
-    'pms': {'name': 'Piedmontese', 'flag': '🇮🇹'},
-    'nap': {'name': 'Neapolitan', 'flag': '🇮🇹'},
-    'scn': {'name': 'Sicilian', 'flag': '🇮🇹'},
-    'co': {'name': 'Corsican', 'flag': '🇫🇷'},
-    'oc': {'name': 'Occitan', 'flag': '🇫🇷'},
-    'gsw': {'name': 'Swiss German', 'flag': '🇨🇭'},
-    'bar': {'name': 'Bavarian', 'flag': '🇩🇪'},
-    'ksh': {'name': 'Colognian', 'flag': '🇩🇪'},
-    'swg': {'name': 'Swabian', 'flag': '🇩🇪'},
-    'pfl': {'name': 'Palatinate German', 'flag': '🇩🇪'},
-    'sxu': {'name': 'Upper Saxon', 'flag': '🇩🇪'},
-    'wae': {'name': 'Walser', 'flag': '🇨🇭'},
-    'grc': {'name': 'Ancient Greek', 'flag': '🏛️'},
-    'la': {'name': 'Latin', 'flag': '🏛️'},
-    'ang': {'name': 'Old English', 'flag': '🏛️'},
-    'fro': {'name': 'Old French', 'flag': '🏛️'},
-    'goh': {'name': 'Old High German', 'flag': '🏛️'},
-    'non': {'name': 'Old Norse', 'flag': '🏛️'},
-    'peo': {'name': 'Old Persian', 'flag': '🏛️'},
-    'sga': {'name': 'Old Irish', 'flag': '🏛️'},
-    'sla': {'name': 'Proto-Slavic', 'flag': '🏛️'},
-    'ine': {'name': 'Proto-Indo-European', 'flag': '🏛️'},
-    'afa': {'name': 'Afro-Asiatic', 'flag': '🌍'},
-    'nic': {'name': 'Niger-Congo', 'flag': '🌍'},
-    'cau': {'name': 'Caucasian', 'flag': '🌍'},
-    'dra': {'name': 'Dravidian', 'flag': '🌍'},
-    'tut': {'name': 'Altaic', 'flag': '🌍'},
-    'qwe': {'name': 'Quechuan', 'flag': '🌍'},
-    'nai': {'name': 'North American Indian', 'flag': '🌍'},
-    'cai': {'name': 'Central American Indian', 'flag': '🌍'},
-    'sai': {'name': 'South American Indian', 'flag': '🌍'},
-    'map': {'name': 'Austronesian', 'flag': '🌍'},
-    'aus': {'name': 'Australian Aboriginal', 'flag': '🌍'},
-    'paa': {'name': 'Papuan', 'flag': '🌍'},
-    'art': {'name': 'Artificial', 'flag': '🤖'},
-    'mis': {'name': 'Uncoded', 'flag': '❓'},
-    'mul': {'name': 'Multiple', 'flag': '🌐'},
-    'und': {'name': 'Undetermined', 'flag': '❓'},
-    'zxx': {'name': 'No linguistic content', 'flag': '📄'},
-    'xxx': {'name': 'Unassigned', 'flag': '❓'}
-}
+@functools.cache
+def get_languages() -> dict:
+    """Supported languages (code -> name/flag), loaded from languages.json on first use."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'languages.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def translate_text(text, dest_lang='en'):
     """Translate text to specified language"""
@@ -1302,10 +1797,10 @@ def extract_framing_and_story(transcript):
     try:
         # Simple extraction - you can enhance this based on your needs
         # For now, we'll use the first sentence as framing and the rest as story
-        sentences = transcript.split('.')
-        if len(sentences) > 1:
-            framing = sentences[0].strip() + '.'
-            story = '.'.join(sentences[1:]).strip()
+        head, sep, tail = transcript.partition('.')
+        if sep:
+            framing = head.strip() + '.'
+            story = tail.strip()
         else:
             framing = "Personal growth and reflection"
             story = transcript
@@ -1315,84 +1810,114 @@ def extract_framing_and_story(transcript):
         logger.error(f"Error extracting framing and story: {e}")
         return "Personal growth and reflection", transcript
 
+# Patterns for clean_lucy_story, compiled once at import
+_LUCY_BOLD_HEADER = re.compile(r'#+\s*\*\*(.*?)\*\*')
+_LUCY_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_LUCY_QUOTE_QUOTED = re.compile(r'>\s*"(.*?)"')
+_LUCY_QUOTE = re.compile(r'>\s*(.*?)(?=\n|$)')
+_LUCY_CTA_LABEL = re.compile(r'🎯 Final CTA:\s*')
+# Emoji and pictograph blocks; every match is a single codepoint, so a delete table replaces the regex
+_LUCY_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F), (0x1F300, 0x1F5FF), (0x1F680, 0x1F6FF), (0x1F700, 0x1F77F),
+    (0x1F780, 0x1F7FF), (0x1F800, 0x1F8FF), (0x1F900, 0x1F9FF), (0x1FA00, 0x1FA6F),
+    (0x1FA70, 0x1FAFF), (0x2600, 0x26FF), (0x2700, 0x27BF),
+)
+_LUCY_EMOJI_TABLE = {cp: None for lo, hi in _LUCY_EMOJI_RANGES for cp in range(lo, hi + 1)}
+_LUCY_PLACEHOLDER = re.compile(r"\[[^\]]*\]")
+# Symbols that also swallow the whitespace after them: one regex pass with a lookup
+_LUCY_SPACED_SYMBOLS = {'#': '', '@': '', '&': ' and ', '%': ' percent ', '$': ' dollars '}
+_LUCY_SPACED_SYMBOL = re.compile(r'([#@&%$])\s*')
+# Plain single-character rewrites: one str.translate pass
+_LUCY_SYMBOL_TRANS = str.maketrans({
+    '+': ' plus ', '=': ' equals ', '/': ' slash ', '\\': ' backslash ', '*': '',
+    '_': ' ', '|': ' or ', '~': ' approximately ', '^': ' to the power of ',
+})
+_LUCY_CUT_BOARD = re.compile(r'cut\s*board', re.IGNORECASE)
+_LUCY_HASH_TAG = re.compile(r'hash\s*tag', re.IGNORECASE)
+_LUCY_CUT_MARKER = re.compile(r'\bCUT\s*\d+\s*\n')
+_LUCY_MANY_NEWLINES = re.compile(r'\n{4,}')
+_LUCY_MANY_SPACES = re.compile(r'[ \t]{2,}')
+_LUCY_SENTENCE_GAP = re.compile(r'([.!?])\s*([A-Z])')
+_LUCY_LINE_BULLET = re.compile(r'^\s*[-*]\s*', re.MULTILINE)
+_LUCY_LINE_QUOTE = re.compile(r'^\s*>\s*', re.MULTILINE)
+_LUCY_LINE_HEADER = re.compile(r'^\s*#+\s*', re.MULTILINE)
+# Runs of the same . , ! or ? collapse to one; a single backreference pass
+_LUCY_REPEATED_PUNCT = re.compile(r'([.,!?])\1+')
+
 def clean_lucy_story(story):
     """Clean and format Lucy's story content by removing markdown symbols and HeyGen-speaking symbols for clean output"""
     try:
         cleaned = story.strip()
         
         # Remove markdown symbols while preserving content
-        cleaned = re.sub(r'#+\s*\*\*(.*?)\*\*', r'\1', cleaned)
-        cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
-        cleaned = re.sub(r'>\s*"(.*?)"', r'"\1"', cleaned)
-        cleaned = re.sub(r'>\s*(.*?)(?=\n|$)', r'\1', cleaned)
+        cleaned = _LUCY_BOLD_HEADER.sub(r'\1', cleaned)
+        cleaned = _LUCY_BOLD.sub(r'\1', cleaned)
+        cleaned = _LUCY_QUOTE_QUOTED.sub(r'"\1"', cleaned)
+        cleaned = _LUCY_QUOTE.sub(r'\1', cleaned)
         
         # Remove "🎯 Final CTA:" label but keep the content
-        cleaned = re.sub(r'🎯 Final CTA:\s*', '', cleaned)
+        cleaned = _LUCY_CTA_LABEL.sub('', cleaned)
         
         # Strip emojis and pictographs entirely
-        emoji_pattern = re.compile(
-            r"[\U0001F600-\U0001F64F]|[\U0001F300-\U0001F5FF]|[\U0001F680-\U0001F6FF]|[\U0001F700-\U0001F77F]|[\U0001F780-\U0001F7FF]|[\U0001F800-\U0001F8FF]|[\U0001F900-\U0001F9FF]|[\U0001FA00-\U0001FA6F]|[\U0001FA70-\U0001FAFF]|[\u2600-\u26FF]|[\u2700-\u27BF]",
-            flags=re.UNICODE
-        )
-        cleaned = emoji_pattern.sub('', cleaned)
+        cleaned = cleaned.translate(_LUCY_EMOJI_TABLE)
 
         # Remove bracketed placeholders like [website]
-        cleaned = re.sub(r"\[[^\]]*\]", '', cleaned)
+        cleaned = _LUCY_PLACEHOLDER.sub('', cleaned)
 
         # Symbols normalization
-        cleaned = re.sub(r'#\s*', '', cleaned)
-        cleaned = re.sub(r'@\s*', '', cleaned)
-        cleaned = re.sub(r'&\s*', ' and ', cleaned)
-        cleaned = re.sub(r'%\s*', ' percent ', cleaned)
-        cleaned = re.sub(r'\$\s*', ' dollars ', cleaned)
-        cleaned = re.sub(r'\+', ' plus ', cleaned)
-        cleaned = re.sub(r'=', ' equals ', cleaned)
-        cleaned = re.sub(r'/', ' slash ', cleaned)
-        cleaned = re.sub(r'\\', ' backslash ', cleaned)
-        cleaned = re.sub(r'\*', '', cleaned)
-        cleaned = re.sub(r'_', ' ', cleaned)
-        cleaned = re.sub(r'\|', ' or ', cleaned)
-        cleaned = re.sub(r'~', ' approximately ', cleaned)
-        cleaned = re.sub(r'\^', ' to the power of ', cleaned)
+        cleaned = _LUCY_SPACED_SYMBOL.sub(lambda m: _LUCY_SPACED_SYMBOLS[m.group(1)], cleaned)
+        cleaned = cleaned.translate(_LUCY_SYMBOL_TRANS)
 
         # Common misreads
-        cleaned = re.sub(r'cut\s*board', 'clipboard', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'hash\s*tag', 'hashtag', cleaned, flags=re.IGNORECASE)
+        cleaned = _LUCY_CUT_BOARD.sub('clipboard', cleaned)
+        cleaned = _LUCY_HASH_TAG.sub('hashtag', cleaned)
 
         # Remove CUT markers completely
-        cleaned = re.sub(r'\bCUT\s*\d+\s*\n', '', cleaned)
+        cleaned = _LUCY_CUT_MARKER.sub('', cleaned)
 
         # Normalize excessive line breaks (keep meaningful newlines)
-        cleaned = re.sub(r'\n{4,}', '\n\n\n', cleaned)
+        cleaned = _LUCY_MANY_NEWLINES.sub('\n\n\n', cleaned)
         # Reduce multiple spaces but do NOT touch newlines
-        cleaned = re.sub(r'[ \t]{2,}', ' ', cleaned)
+        cleaned = _LUCY_MANY_SPACES.sub(' ', cleaned)
 
         # Sentence spacing
-        cleaned = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', cleaned)
+        cleaned = _LUCY_SENTENCE_GAP.sub(r'\1 \2', cleaned)
         
         # Clean up leftover markdown on line starts
-        cleaned = re.sub(r'^\s*[-*]\s*', '', cleaned, flags=re.MULTILINE)
-        cleaned = re.sub(r'^\s*>\s*', '', cleaned, flags=re.MULTILINE)
-        cleaned = re.sub(r'^\s*#+\s*', '', cleaned, flags=re.MULTILINE)
+        cleaned = _LUCY_LINE_BULLET.sub('', cleaned)
+        cleaned = _LUCY_LINE_QUOTE.sub('', cleaned)
+        cleaned = _LUCY_LINE_HEADER.sub('', cleaned)
 
         # Normalize repeated punctuation
-        cleaned = re.sub(r'\.{2,}', '.', cleaned)
-        cleaned = re.sub(r',{2,}', ',', cleaned)
-        cleaned = re.sub(r'!{2,}', '!', cleaned)
-        cleaned = re.sub(r'\?{2,}', '?', cleaned)
+        cleaned = _LUCY_REPEATED_PUNCT.sub(r'\1', cleaned)
 
         return cleaned.strip()
     except Exception as e:
         logger.error(f"Error cleaning story: {e}")
         return story
 
+_HEADING_REJECT_SUFFIXES = frozenset('.!?"\':')
+# Three or more consecutive blank lines (4+ newlines) collapse to two
+_BLANK_RUN_RE = re.compile(r'\n{4,}')
+
+def _is_heading(s: str) -> bool:
+    # Cheapest tests first: most body lines fail on length or the first character.
+    # An uppercase first char also rules out the old '-', '*', quote and '[' prefixes.
+    if not (3 <= len(s) <= 90) or not s[0].isupper():
+        return False
+    if s[-1] in _HEADING_REJECT_SUFFIXES and not s.endswith('Summary:'):
+        # Lines ending with terminal punctuation are likely sentences
+        return False
+    # Treat short, capitalized or title-like lines as headings; an uppercase
+    # first letter already satisfies the "has a letter" test, so scan only otherwise
+    return s[0].isalpha() or any(ch.isalpha() for ch in s)
+
 def format_story_universal(text: str) -> str:
     """Enforce universal line-breaking format: blank line after title, between sections, and paragraphs.
     Assumes input is already cleaned of emojis/symbols. Also adds dashed underlines to clear section headings."""
     try:
-        # Normalize line endings
-        t = text.replace('\r\n', '\n').replace('\r', '\n').strip()
-        lines = [l.strip() for l in t.split('\n')]
+        # splitlines() normalizes \r\n / \r line endings as it splits
+        lines = [l.strip() for l in text.strip().splitlines()]
         # Remove consecutive empty lines
         compact = []
         for l in lines:
@@ -1410,18 +1935,8 @@ def format_story_universal(text: str) -> str:
         # Insert blank lines before likely section headers and underline them
         result = []
         prev_blank = True
-        def is_heading(s: str) -> bool:
-            if not s:
-                return False
-            if s.startswith(('-', '*', '"', "'", '[')):
-                return False
-            if s.endswith(('.', '!', '?', '"', "'", ':')) and not s.endswith('Summary:'):
-                # Lines ending with terminal punctuation are likely sentences
-                return False
-            # Treat short, capitalized or title-like lines as headings
-            return (3 <= len(s) <= 90) and any(ch.isalpha() for ch in s) and (s[0].isupper())
         for l in out:
-            if is_heading(l):
+            if _is_heading(l):
                 if not prev_blank and len(result) > 0:
                     result.append('')
                 # Heading line
@@ -1436,61 +1951,65 @@ def format_story_universal(text: str) -> str:
             result.append(l)
             prev_blank = (l == '')
         # Collapse excessive blank lines to max 2
-        final_lines = []
-        blank_count = 0
-        for l in result:
-            if l == '':
-                blank_count += 1
-                if blank_count <= 2:
-                    final_lines.append('')
-            else:
-                blank_count = 0
-                final_lines.append(l)
-        formatted = '\n'.join(final_lines).strip() + '\n'
+        formatted = _BLANK_RUN_RE.sub('\n\n\n', '\n'.join(result)).strip() + '\n'
         return formatted
     except Exception as e:
         logger.warning(f"format_story_universal failed: {e}")
         return text
 
+# Markdown stripping for word counts: bold first, then '#'/'>' runs with trailing whitespace
+_MD_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_MD_MARKERS = re.compile(r'[#>]+\s*')
+# Same result as .replace('#', '').replace('**', '') in one pass: a '**' pair may
+# straddle '#'s that the first replace would have removed
+_TITLE_CLEAN = re.compile(r'#+|\*#*\*')
+# Likewise for .replace('##', '').replace('**', '')
+_SEGMENT_TITLE_CLEAN = re.compile(r'(?:##)+|\*(?:##)*\*')
+
 def parse_story_to_json(story_text):
     """Parse story text into structured JSON format with markdown formatting"""
     try:
         # Preserve markdown formatting for better display
-        lines = story_text.split('\n')
+        lines = story_text.splitlines()
         
         # Extract title (first line with # or bold formatting)
         title = "Generated Story"
         for line in lines:
             line = line.strip()
             if line.startswith('#') or line.startswith('**') or 'Lucy & The Wealth Machine:' in line:
-                title = line.replace('#', '').replace('**', '').strip()
+                title = _TITLE_CLEAN.sub('', line).strip()
                 break
         
-        # Extract core lessons
+        # Extract core lessons and segments in one pass; skip it when neither marker occurs
         key_points = []
-        in_lessons_section = False
-        
-        for line in lines:
-            line = line.strip()
-            if 'Core Lessons:' in line or '**Core Lessons:**' in line:
-                in_lessons_section = True
-                continue
-            elif in_lessons_section and line.startswith('##'):
-                break
-            elif in_lessons_section and line.startswith('-') and line:
-                key_points.append(line)
-        
-        # Extract segments with markdown formatting
+        lessons_state = 0  # 0 = before section, 1 = inside, 2 = finished
         segments = []
         current_segment = None
+        has_lessons = 'Core Lessons:' in story_text
+        # A segment only starts on a '##' line carrying the clapper marker
+        has_segments = '🎬' in story_text and '##' in story_text
         
-        for line in lines:
+        for line in (lines if has_lessons or has_segments else ()):
             line = line.strip()
+            if has_lessons and lessons_state < 2:
+                if lessons_state == 0:
+                    if 'Core Lessons:' in line:
+                        lessons_state = 1
+                elif 'Core Lessons:' in line:
+                    pass
+                elif line.startswith('##'):
+                    lessons_state = 2
+                elif line.startswith('-'):
+                    key_points.append(line)
+            
+            if not has_segments:
+                continue
+            # Segments with markdown formatting
             if line.startswith('##') and '🎬' in line:
                 if current_segment:
                     segments.append(current_segment)
                 current_segment = {
-                    'title': line.replace('##', '').replace('**', '').strip(),
+                    'title': _SEGMENT_TITLE_CLEAN.sub('', line).strip(),
                     'content': [],
                     'hooks': [],
                     'main_content': '',
@@ -1518,18 +2037,16 @@ def parse_story_to_json(story_text):
         
         # Extract final CTA
         final_cta = ""
-        for line in lines:
-            if '🎯 Final CTA:' in line or '**🎯 Final CTA:**' in line:
+        for cta_index, line in enumerate(lines if '🎯 Final CTA:' in story_text else ()):
+            if '🎯 Final CTA:' in line:
                 # Get the next line as CTA
-                cta_index = lines.index(line)
                 if cta_index + 1 < len(lines):
                     final_cta = lines[cta_index + 1].strip()
                 break
         
         # Clean content for word count (remove markdown)
-        clean_content = re.sub(r'\*\*(.*?)\*\*', r'\1', story_text)
-        clean_content = re.sub(r'#+\s*', '', clean_content)
-        clean_content = re.sub(r'>\s*', '', clean_content)
+        clean_content = _MD_MARKERS.sub('', _MD_BOLD.sub(r'\1', story_text))
+        word_count = len(clean_content.split())
         
         return {
             'title': title,
@@ -1537,8 +2054,8 @@ def parse_story_to_json(story_text):
             'key_points': key_points,
             'segments': segments,
             'final_cta': final_cta,
-            'word_count': len(clean_content.split()),
-            'estimated_read_time': max(1, len(clean_content.split()) // 200),
+            'word_count': word_count,
+            'estimated_read_time': max(1, word_count // 200),
             'structure': 'markdown_voiceover_script',
             'formatting': 'universal_markdown'
         }
@@ -1584,12 +2101,60 @@ def delete_trimmed():
 @app.route('/')
 def main_landing():
     """Main landing page - StoryVerse AI"""
-    return render_template('LandingPage.html', languages=LANGUAGES)
+    return render_template('LandingPage.html', languages=get_languages())
 
 @app.route('/landing')
 def landing_page():
     """Alternative landing page route"""
-    return render_template('LandingPage.html', languages=LANGUAGES)
+    return render_template('LandingPage.html', languages=get_languages())
+
+# Extensions shown in the video listings (edit page, existing videos, dashboard)
+_VIDEO_EXTS = frozenset({'.mp4', '.mov', '.avi', '.mkv'})
+
+def _is_listed_video(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in _VIDEO_EXTS
+
+def _iter_original_videos(folder: str, url_prefix: str = ''):
+    """Yield video entries directly in `folder` and one level of subfolders."""
+    if not os.path.exists(folder):
+        return
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            item = entry.name
+            if entry.is_dir():
+                # Look for video files in subdirectories
+                with os.scandir(entry.path) as sub_entries:
+                    for sub_entry in sub_entries:
+                        file = sub_entry.name
+                        if _is_listed_video(file):
+                            yield {
+                                'name': file,
+                                'path': f'{url_prefix}videos/{item}/{file}',
+                                'type': 'original',
+                                'folder': item
+                            }
+            elif _is_listed_video(item):
+                yield {
+                    'name': item,
+                    'path': f'{url_prefix}videos/{item}',
+                    'type': 'original',
+                    'folder': 'root'
+                }
+
+def _iter_trimmed_videos(folder: str, url_prefix: str = ''):
+    """Yield video entries in a trimmed-clips folder."""
+    if not os.path.exists(folder):
+        return
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            file = entry.name
+            if _is_listed_video(file):
+                yield {
+                    'name': file,
+                    'path': f'{url_prefix}trimmed/{file}',
+                    'type': 'trimmed',
+                    'folder': 'trimmed'
+                }
 
 @app.route('/api/existing-videos')
 def get_existing_videos():
@@ -1601,38 +2166,11 @@ def get_existing_videos():
             return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
         videos_folder = get_user_subdir(user['id'], 'videos')
-        if os.path.exists(videos_folder):
-            for item in os.listdir(videos_folder):
-                item_path = os.path.join(videos_folder, item)
-                if os.path.isdir(item_path):
-                    # Look for video files in subdirectories
-                    for file in os.listdir(item_path):
-                        if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                            videos.append({
-                                'name': file,
-                                'path': f'/videos/{item}/{file}',
-                                'type': 'original',
-                                'folder': item
-                            })
-                elif item.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                    videos.append({
-                        'name': item,
-                        'path': f'/videos/{item}',
-                        'type': 'original',
-                        'folder': 'root'
-                    })
+        videos.extend(_iter_original_videos(videos_folder, '/'))
 
         # Get trimmed videos from user folder
         trimmed_folder = get_user_subdir(user['id'], 'trimmed')
-        if os.path.exists(trimmed_folder):
-            for file in os.listdir(trimmed_folder):
-                if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                    videos.append({
-                        'name': file,
-                        'path': f'/trimmed/{file}',
-                        'type': 'trimmed',
-                        'folder': 'trimmed'
-                    })
+        videos.extend(_iter_trimmed_videos(trimmed_folder, '/'))
         
         return jsonify({
             'success': True,
@@ -1643,6 +2181,57 @@ def get_existing_videos():
         logging.error(f"Error getting existing videos: {e}")
         return jsonify({'success': False, 'message': str(e)})
 
+# ffmpeg is installed in the image (or not) for the life of the process; probe once
+_FFMPEG_AVAILABLE = shutil.which('ffmpeg') is not None
+# Set when launching ffmpeg failed, so the next check probes again instead of trusting the cache
+_FFMPEG_MAYBE_BROKEN = False
+
+def _ffmpeg_available() -> bool:
+    global _FFMPEG_AVAILABLE, _FFMPEG_MAYBE_BROKEN
+    if _FFMPEG_MAYBE_BROKEN:
+        _FFMPEG_MAYBE_BROKEN = False
+        _FFMPEG_AVAILABLE = shutil.which('ffmpeg') is not None
+    return _FFMPEG_AVAILABLE
+
+def _note_ffmpeg_launch_failure():
+    global _FFMPEG_MAYBE_BROKEN
+    _FFMPEG_MAYBE_BROKEN = True
+
+# Containers ffmpeg can demux from a non-seekable pipe
+_PIPE_SAFE_CLIP_EXTS = ('.mkv', '.webm')
+
+def _run_ffmpeg_piped(cmd, stream, timeout):
+    """Run ffmpeg reading input from `stream` on stdin; returns (returncode, stderr).
+
+    `timeout` bounds the whole run, including feeding stdin from a slow client."""
+    deadline = time.monotonic() + timeout
+    # stderr goes to a temp file so a chatty ffmpeg can't block while we write stdin
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=err)
+
+        def feed():
+            try:
+                shutil.copyfileobj(stream, proc.stdin, 1024 * 1024)
+            except (OSError, ValueError):
+                pass  # ffmpeg stopped reading once it had the requested duration, or was killed
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+        # Feed from a helper thread so a stalled read or write can't outlive the deadline
+        feeder = threading.Thread(target=feed, daemon=True, name='ffmpeg-stdin')
+        feeder.start()
+        try:
+            returncode = proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        err.seek(0)
+        return returncode, err.read().decode('utf-8', 'replace')
+
 @app.route('/api/create-video-clip', methods=['POST'])
 def create_video_clip():
     """Create a video clip from uploaded video file"""
@@ -1662,7 +2251,7 @@ def create_video_clip():
             return jsonify({'success': False, 'message': 'No file selected'}), 400
         
         # Validate file type
-        if not file.filename.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm')):
+        if _file_ext(file.filename) not in _MEDIA_VIDEO_EXTS:
             return jsonify({'success': False, 'message': 'Invalid file type. Please upload MP4, MOV, AVI, MKV, or WEBM files.'}), 400
         
         start_time = float(request.form.get('start_time', 0))
@@ -1680,21 +2269,22 @@ def create_video_clip():
         clip_filename = f"{base_name}_clip_{timestamp}.mp4"
         clip_path = os.path.join(trimmed_folder, clip_filename)
         
-        # Save uploaded file temporarily (in user trimmed folder)
-        temp_path = os.path.join(trimmed_folder, f"temp_{file.filename}")
-        file.save(temp_path)
+        if not _ffmpeg_available():
+            return jsonify({'success': False, 'message': 'FFmpeg is not available. Please install FFmpeg to use this feature.'}), 500
+        
+        # Streamable containers are piped straight into ffmpeg; MP4/MOV/AVI may keep
+        # their index at the end of the file, so those still go through a temp file
+        pipe_input = file.filename.lower().endswith(_PIPE_SAFE_CLIP_EXTS)
+        temp_path = None
+        if not pipe_input:
+            temp_path = os.path.join(trimmed_folder, f"temp_{file.filename}")
+            file.save(temp_path, buffer_size=_UPLOAD_COPY_BUFSIZE)
         
         try:
-            # Check if ffmpeg is available
-            try:
-                subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                return jsonify({'success': False, 'message': 'FFmpeg is not available. Please install FFmpeg to use this feature.'}), 500
-            
-            # Use ffmpeg to create the clip
+            # Use ffmpeg to create the clip (-ss before -i seeks on input)
             cmd = [
-                'ffmpeg', '-i', temp_path,
-                '-ss', str(start_time),
+                'ffmpeg', '-ss', str(start_time),
+                '-i', 'pipe:0' if pipe_input else temp_path,
                 '-t', str(end_time - start_time),
                 '-c:v', 'libx264',
                 '-c:a', 'aac',
@@ -1702,10 +2292,14 @@ def create_video_clip():
                 clip_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            if pipe_input:
+                returncode, stderr = _run_ffmpeg_piped(cmd, file.stream, timeout=300)
+            else:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+                returncode, stderr = result.returncode, result.stderr
             
-            if result.returncode != 0:
-                logging.error(f"FFmpeg error: {result.stderr}")
+            if returncode != 0:
+                logging.error(f"FFmpeg error: {stderr}")
                 return jsonify({'success': False, 'message': 'Failed to create video clip. Please check if the video file is valid.'}), 500
             
             # Verify the output file was created
@@ -1718,10 +2312,6 @@ def create_video_clip():
             # Get day name
             day_name = datetime.now().strftime('%A')
             
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            
             # Store clip information in database or return success
             return jsonify({
                 'success': True,
@@ -1738,11 +2328,13 @@ def create_video_clip():
         except subprocess.TimeoutExpired:
             return jsonify({'success': False, 'message': 'Video processing timed out. Please try with a shorter clip duration.'}), 500
         except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                _note_ffmpeg_launch_failure()
             logging.error(f"Error creating video clip: {e}")
             return jsonify({'success': False, 'message': 'Failed to create video clip. Please try again.'}), 500
         finally:
-            # Clean up temp file if it still exists
-            if os.path.exists(temp_path):
+            # Clean up temp file if one was written
+            if temp_path and os.path.exists(temp_path):
                 os.remove(temp_path)
                 
     except Exception as e:
@@ -1797,10 +2389,7 @@ def trim_video():
         if not os.path.exists(source_file_path):
             return jsonify({'success': False, 'error': 'Source video not found'}), 404
         
-        # Check if ffmpeg is available
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if not _ffmpeg_available():
             return jsonify({'success': False, 'error': 'FFmpeg is not available. Please install FFmpeg to use this feature.'}), 500
         
         # Create user trimmed folder
@@ -1808,6 +2397,9 @@ def trim_video():
         
         created_clips = []
         
+        base_name = os.path.splitext(os.path.basename(source_file_path))[0]
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        planned = []
         for i, clip in enumerate(clips):
             start_time = float(clip.get('start', 0))
             end_time = float(clip.get('end', 30))
@@ -1816,30 +2408,72 @@ def trim_video():
                 continue
             
             # Generate unique filename for the clip
-            base_name = os.path.splitext(os.path.basename(source_file_path))[0]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             clip_filename = f"{base_name}_trim_{start_time:.1f}-{end_time:.1f}_{timestamp}.mp4"
-            clip_path = os.path.join(trimmed_folder, clip_filename)
-            
+            planned.append((i, start_time, end_time, clip_filename, os.path.join(trimmed_folder, clip_filename)))
+        
+        # ffmpeg results keyed by output path; clips without one (or with a failed one)
+        # are re-encoded individually below
+        results = {}
+        # Batched runs share the old per-clip budget (300 s each) across the batch and any retries
+        deadline = None
+        if len(clips) == 1 and planned:
+            # Super-fast: if only one clip, attempt stream copy (no re-encode)
+            _, start_time, end_time, _, clip_path = planned[0]
+            copy_cmd = [
+                'ffmpeg',
+                '-ss', str(start_time),
+                '-to', str(end_time),
+                '-i', source_file_path,
+                '-c', 'copy',
+                '-movflags', '+faststart',
+                '-avoid_negative_ts', '1',
+                '-y',
+                clip_path
+            ]
             try:
-                # Super-fast: if only one clip, attempt stream copy (no re-encode)
-                result = None
-                if len(clips) == 1:
-                    copy_cmd = [
-                        'ffmpeg',
-                        '-ss', str(start_time),
-                        '-to', str(end_time),
-                        '-i', source_file_path,
-                        '-c', 'copy',
-                        '-movflags', '+faststart',
-                        '-avoid_negative_ts', '1',
-                        '-y',
-                        clip_path
-                    ]
-                    result = subprocess.run(copy_cmd, capture_output=True, text=True, timeout=120)
-
-                # Fallback to precise re-encode if fast path not used or failed
+                results[clip_path] = subprocess.run(copy_cmd, capture_output=True, text=True, timeout=120)
+            except subprocess.TimeoutExpired:
+                logging.error("FFmpeg timeout for stream-copy trim")
+        elif len(planned) > 1:
+            # Several clips: decode the source once and encode every clip from that pass
+            outputs = {clip_path: (start_time, end_time) for _, start_time, end_time, _, clip_path in planned}
+            cmd = ['ffmpeg', '-i', source_file_path]
+            for clip_path, (start_time, end_time) in outputs.items():
+                cmd += [
+                    '-ss', str(start_time),
+                    '-t', str(end_time - start_time),
+                    '-c:v', 'libx264',
+                    '-c:a', 'aac',
+                    '-y',  # Overwrite output file
+                    clip_path
+                ]
+            deadline = time.monotonic() + 300 * len(outputs)
+            try:
+                batch = subprocess.run(cmd, capture_output=True, text=True, timeout=300 * len(outputs))
+                if batch.returncode == 0:
+                    results = dict.fromkeys(outputs, batch)
+                else:
+                    logging.warning(f"Batched FFmpeg trim failed, retrying clips one by one: {batch.stderr}")
+            except subprocess.TimeoutExpired:
+                logging.error("FFmpeg timeout for batched trim")
+            if not results:
+                # One pass writes every output, so a failed or killed batch leaves them all truncated
+                for clip_path in outputs:
+                    _remove_quietly(clip_path)
+        
+        for i, start_time, end_time, clip_filename, clip_path in planned:
+            try:
+                result = results.get(clip_path)
+
+                # Fallback to precise re-encode if no batched/fast result or it failed
                 if result is None or result.returncode != 0 or not os.path.exists(clip_path):
+                    timeout = 300
+                    if deadline is not None:
+                        timeout = min(timeout, deadline - time.monotonic())
+                        if timeout <= 0:
+                            logging.error(f"No time left to re-encode clip {i}")
+                            _remove_quietly(clip_path)
+                            continue
                     cmd = [
                         'ffmpeg', '-i', source_file_path,
                         '-ss', str(start_time),
@@ -1849,7 +2483,7 @@ def trim_video():
                         '-y',  # Overwrite output file
                         clip_path
                     ]
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
                 
                 if result.returncode == 0:
                     # Verify the output file was created
@@ -1865,9 +2499,12 @@ def trim_video():
                         logging.error(f"Clip file was not created for clip {i}")
                 else:
                     logging.error(f"FFmpeg error for clip {i}: {result.stderr}")
+                    _remove_quietly(clip_path)
                     
             except subprocess.TimeoutExpired:
                 logging.error(f"FFmpeg timeout for clip {i}")
+                # Don't leave a half-written clip in the user's trimmed listing
+                _remove_quietly(clip_path)
             except Exception as e:
                 logging.error(f"Error creating clip {i}: {e}")
         
@@ -1881,9 +2518,26 @@ def trim_video():
             return jsonify({'success': False, 'error': 'Failed to create any clips'}), 500
             
     except Exception as e:
+        if isinstance(e, FileNotFoundError):
+            _note_ffmpeg_launch_failure()
         logging.error(f"Error in trim_video: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Clip/upload names carry timestamps, so browsers may reuse them for a while
+_USER_MEDIA_MAX_AGE = 3600
+
+def _send_user_media(directory: str, filename: str):
+    """Serve a per-user media file; a missing file is a plain 404 rather than an
+    exists() stat before send_from_directory stats it again."""
+    try:
+        rv = send_from_directory(directory, filename, conditional=True, max_age=_USER_MEDIA_MAX_AGE)
+    except NotFound:
+        return jsonify({'error': 'Video not found'}), 404
+    # Session-scoped content: cacheable by the browser only, never by shared proxies
+    rv.cache_control.public = False
+    rv.cache_control.private = True
+    return rv
+
 @app.route('/trimmed/<filename>')
 def serve_trimmed_video(filename):
     """Serve trimmed video files"""
@@ -1891,11 +2545,7 @@ def serve_trimmed_video(filename):
         user = get_session_user()
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
-        user_dir = get_user_subdir(user['id'], 'trimmed')
-        user_path = os.path.join(user_dir, filename)
-        if os.path.exists(user_path):
-            return send_from_directory(user_dir, filename)
-        return jsonify({'error': 'Video not found'}), 404
+        return _send_user_media(get_user_subdir(user['id'], 'trimmed'), filename)
     except Exception as e:
         logging.error(f"Error serving trimmed video {filename}: {e}")
         return jsonify({'error': 'Video not found'}), 404
@@ -1907,11 +2557,7 @@ def serve_video(filename):
         user = get_session_user()
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
-        user_dir = get_user_subdir(user['id'], 'videos')
-        user_path = os.path.join(user_dir, filename)
-        if os.path.exists(user_path):
-            return send_from_directory(user_dir, filename)
-        return jsonify({'error': 'Video not found'}), 404
+        return _send_user_media(get_user_subdir(user['id'], 'videos'), filename)
     except Exception as e:
         logging.error(f"Error serving video {filename}: {e}")
         return jsonify({'error': 'Video not found'}), 404
@@ -1923,7 +2569,7 @@ def serve_uploaded_video(filename):
         user = get_session_user()
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
-        return send_from_directory(get_user_subdir(user['id'], 'uploads'), filename)
+        return _send_user_media(get_user_subdir(user['id'], 'uploads'), filename)
     except Exception as e:
         logging.error(f"Error serving uploaded video {filename}: {e}")
         return jsonify({'error': 'Video not found'}), 404
@@ -1940,38 +2586,35 @@ def get_trimmed_videos_dashboard():
         seen_filenames = set()
         
         # Load uploaded records for this user to mark cards
-        uploaded_filenames = set()
+        uploaded_filenames = frozenset()
         try:
-            if os.path.exists('youtube_uploads.json'):
-                with open('youtube_uploads.json', 'r') as f:
-                    uploads = json.load(f)
-                    for u in uploads:
-                        if u.get('user_id') == user['id'] and u.get('status') == 'uploaded':
-                            uploaded_filenames.add(u.get('filename'))
+            uploaded_filenames = _uploaded_filenames_for(user['id'])
         except Exception:
             pass
 
         if os.path.exists(trimmed_folder):
-            for file in os.listdir(trimmed_folder):
-                if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                    file_path = os.path.join(trimmed_folder, file)
-                    file_stat = os.stat(file_path)
-                    created_date = datetime.fromtimestamp(file_stat.st_mtime)
-                    file_size = file_stat.st_size
-                    size_mb = round(file_size / (1024 * 1024), 2)
-                    videos.append({
-                        'filename': file,
-                        'path': f'/trimmed/{file}',
-                        'created_date': created_date.strftime('%Y-%m-%d'),
-                        'created_time': created_date.strftime('%H:%M:%S'),
-                        'day_name': created_date.strftime('%A'),
-                        'size_mb': size_mb,
-                        'full_path': file_path,
-                        'type': 'trimmed',
-                        'folder': 'trimmed',
-                        'uploaded': file in uploaded_filenames
-                    })
-                    seen_filenames.add(file)
+            with os.scandir(trimmed_folder) as entries:
+                for entry in entries:
+                    file = entry.name
+                    if _is_listed_video(file):
+                        file_path = entry.path
+                        file_stat = entry.stat()
+                        created_date = datetime.fromtimestamp(file_stat.st_mtime)
+                        file_size = file_stat.st_size
+                        size_mb = round(file_size / (1024 * 1024), 2)
+                        videos.append({
+                            'filename': file,
+                            'path': f'/trimmed/{file}',
+                            'created_date': created_date.strftime('%Y-%m-%d'),
+                            'created_time': created_date.strftime('%H:%M:%S'),
+                            'day_name': created_date.strftime('%A'),
+                            'size_mb': size_mb,
+                            'full_path': file_path,
+                            'type': 'trimmed',
+                            'folder': 'trimmed',
+                            'uploaded': file in uploaded_filenames
+                        })
+                        seen_filenames.add(file)
 
         # Per-user only: no legacy/global listing for privacy
             
@@ -1982,13 +2625,14 @@ def get_trimmed_videos_dashboard():
         dashboard_data = {}
         for video in videos:
             date_key = video['created_date']
-            if date_key not in dashboard_data:
-                dashboard_data[date_key] = {
+            group = dashboard_data.get(date_key)
+            if group is None:
+                group = dashboard_data[date_key] = {
                     'date': date_key,
                     'day_name': video['day_name'],
                     'videos': []
                 }
-            dashboard_data[date_key]['videos'].append(video)
+            group['videos'].append(video)
         
         return jsonify({
             'success': True,
@@ -2006,77 +2650,16 @@ def edit_page():
     """Edit page showing existing videos"""
     try:
         # Get existing videos instead of requiring upload
-        videos = []
-
         # Prefer per-user directories when logged in
         user = get_session_user()
         if user:
-            user_videos_folder = get_user_subdir(user['id'], 'videos')
-            if os.path.exists(user_videos_folder):
-                for item in os.listdir(user_videos_folder):
-                    item_path = os.path.join(user_videos_folder, item)
-                    if os.path.isdir(item_path):
-                        # Look for video files in subdirectories
-                        for file in os.listdir(item_path):
-                            if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                                videos.append({
-                                    'name': file,
-                                    'path': f'videos/{item}/{file}',
-                                    'type': 'original',
-                                    'folder': item
-                                })
-                    elif item.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                        videos.append({
-                            'name': item,
-                            'path': f'videos/{item}',
-                            'type': 'original',
-                            'folder': 'root'
-                        })
-
-            user_trimmed_folder = get_user_subdir(user['id'], 'trimmed')
-            if os.path.exists(user_trimmed_folder):
-                for file in os.listdir(user_trimmed_folder):
-                    if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                        videos.append({
-                            'name': file,
-                            'path': f'trimmed/{file}',
-                            'type': 'trimmed',
-                            'folder': 'trimmed'
-                        })
+            videos_folder = get_user_subdir(user['id'], 'videos')
+            trimmed_folder = get_user_subdir(user['id'], 'trimmed')
         else:
             # Legacy global static directories fallback
             videos_folder = 'static/videos'
-            if os.path.exists(videos_folder):
-                for item in os.listdir(videos_folder):
-                    item_path = os.path.join(videos_folder, item)
-                    if os.path.isdir(item_path):
-                        # Look for video files in subdirectories
-                        for file in os.listdir(item_path):
-                            if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                                videos.append({
-                                    'name': file,
-                                    'path': f'videos/{item}/{file}',
-                                    'type': 'original',
-                                    'folder': item
-                                })
-                    elif item.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                        videos.append({
-                            'name': item,
-                            'path': f'videos/{item}',
-                            'type': 'original',
-                            'folder': 'root'
-                        })
-
             trimmed_folder = 'static/trimmed'
-            if os.path.exists(trimmed_folder):
-                for file in os.listdir(trimmed_folder):
-                    if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-                        videos.append({
-                            'name': file,
-                            'path': f'trimmed/{file}',
-                            'type': 'trimmed',
-                            'folder': 'trimmed'
-                        })
+        videos = [*_iter_original_videos(videos_folder), *_iter_trimmed_videos(trimmed_folder)]
 
         return render_template('edit.html', videos=videos)
         
@@ -2144,36 +2727,32 @@ def test_gemini():
             'error': f'Gemini AI test failed: {str(e)}'
         }), 500
 
+def _story_request_payload() -> dict:
+    """Story request fields as a dict: a JSON object body, a bare JSON string as the
+    prompt, or form data when the body isn't (valid) JSON."""
+    data = request.get_json(silent=True) or request.form.to_dict()
+    if isinstance(data, str):
+        return {'prompt': data}
+    return data if isinstance(data, dict) else {}
+
 @app.route('/api/test-story-simple', methods=['POST'])
 def test_story_simple():
     """Simple story generation test without AI model"""
     try:
-        # Debug: Log the raw request
-        logger.info(f"Simple story test request received")
-        logger.info(f"Request method: {request.method}")
-        logger.info(f"Request headers: {dict(request.headers)}")
-        logger.info(f"Request content type: {request.content_type}")
+        logger.info("Simple story test request received")
         
-        # Try to get JSON data
-        try:
-            data = request.get_json()
-            logger.info(f"Parsed JSON data: {data}")
-        except Exception as json_error:
-            logger.error(f"Failed to parse JSON: {json_error}")
-            # Try to get form data as fallback
-            data = request.form.to_dict()
-            logger.info(f"Using form data as fallback: {data}")
+        data = _story_request_payload()
+        if logger.isEnabledFor(logging.DEBUG):
+            # Raw request details (headers include cookies) only at DEBUG
+            logger.debug("Request %s %s, headers: %s, data: %s",
+                         request.method, request.content_type, request.headers, data)
         
         if not data:
             logger.warning("Simple story test with no data")
             return jsonify({'success': False, 'error': 'No data provided'}), 400
         
         # Try different ways to get the prompt
-        prompt = None
-        if isinstance(data, dict):
-            prompt = data.get('prompt') or data.get('text') or data.get('message')
-        elif isinstance(data, str):
-            prompt = data
+        prompt = data.get('prompt') or data.get('text') or data.get('message')
         
         if not prompt:
             logger.warning(f"Simple story test with missing prompt. Data received: {data}")
@@ -2198,20 +2777,38 @@ def test_story_simple():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # Clean, logical routes for better user experience
+# Pages rendered without per-request context: name -> (template mtime, etag, html).
+# Rendered once per template revision; the mtime check keeps dev edits live.
+_STATIC_PAGES = {}
+
+def _static_page(name: str):
+    """Serve a context-free page from the render cache, with an ETag so
+    revalidating browsers get a 304."""
+    path = os.path.join(app.root_path, app.template_folder, name)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _STATIC_PAGES.get(name)
+    if cached is None or cached[0] != mtime:
+        html = render_template(name)
+        etag = hashlib.sha1(html.encode('utf-8')).hexdigest()
+        cached = _STATIC_PAGES[name] = (mtime, etag, html)
+    rv = make_response(cached[2])
+    rv.set_etag(cached[1])
+    return rv.make_conditional(request)
+
 @app.route('/login')
 def login_page():
     """Login page"""
-    return render_template('login.html')
+    return _static_page('login.html')
 
 @app.route('/signup')
 def signup_page():
     """Signup page"""
-    return render_template('signup.html')
+    return _static_page('signup.html')
 
 @app.route('/story-generator')
 def story_generator():
     """AI Story Generator - main workflow entry point"""
-    return render_template('index.html')
+    return _static_page('index.html')
 
 @app.route('/dashboard')
 def dashboard():
@@ -2221,7 +2818,7 @@ def dashboard():
 @app.route('/forgot-password')
 def forgot_password_page():
     """Forgot password page"""
-    return render_template('forget.html')
+    return _static_page('forget.html')
 
 @app.route('/reset-password')
 def reset_password_page():
@@ -2230,34 +2827,24 @@ def reset_password_page():
     return render_template('reset.html', token=token)
 
 # Keep legacy routes for backward compatibility but redirect to clean URLs
-@app.route('/api/navigate/<page>')
-def legacy_navigate(page):
-    """Legacy navigation endpoint - redirects to clean URLs"""
-    redirects = {
-        'login': '/login',
-        'signup': '/signup',
-        'index': '/story-generator',
-        'forgot': '/forgot-password',
-        'reset': '/reset-password'
-    }
-    return redirect(redirects.get(page, '/'))
+_NAV_REDIRECTS = {
+    'login': '/login',
+    'signup': '/signup',
+    'index': '/story-generator',
+    'forgot': '/forgot-password',
+    'reset': '/reset-password'
+}
 
+@app.route('/api/navigate/<page>', endpoint='legacy_navigate')
 @app.route('/navigate/<page>')
 def navigate(page):
     """Main navigation endpoint - redirects to clean URLs"""
-    redirects = {
-        'login': '/login',
-        'signup': '/signup',
-        'index': '/story-generator',
-        'forgot': '/forgot-password',
-        'reset': '/reset-password'
-    }
-    return redirect(redirects.get(page, '/'))
+    return redirect(_NAV_REDIRECTS.get(page, '/'))
 
 @app.route('/forgot')
 def forgot_page():
     """Forgot password page"""
-    return render_template('forget.html')
+    return _static_page('forget.html')
 
 @app.route('/api/session')
 def session_info():
@@ -2275,13 +2862,9 @@ def db_status():
 def test_db():
     """Test database connection"""
     try:
-        conn = psycopg2.connect(**db_config)
-        conn.autocommit = True
-        cursor = conn.cursor()
-        cursor.execute("SELECT current_database();")
-        db_name = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
+        with pg_conn() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT current_database();")
+            db_name = cursor.fetchone()[0]
         return jsonify({'status': 'success', 'message': f'Database test successful: {db_name}'})
     except psycopg2.Error as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -2300,22 +2883,16 @@ def check_availability():
         return jsonify({'message': 'Please provide username or email to check'}), 400
 
     try:
-        conn = psycopg2.connect(**db_config)
-        conn.autocommit = True
-        cursor = conn.cursor()
-        
         results = {}
         
-        if username:
-            cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
-            results['username_available'] = not cursor.fetchone()
-        
-        if email:
-            cursor.execute("SELECT email FROM users WHERE email = %s", (email,))
-            results['email_available'] = not cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with pg_conn() as conn, conn.cursor() as cursor:
+            if username:
+                cursor.execute("SELECT 1 FROM users WHERE username = %s LIMIT 1", (username,))
+                results['username_available'] = not cursor.fetchone()
+            
+            if email:
+                cursor.execute("SELECT 1 FROM users WHERE email = %s LIMIT 1", (email,))
+                results['email_available'] = not cursor.fetchone()
         
         return jsonify({
             'success': True,
@@ -2326,6 +2903,20 @@ def check_availability():
         logger.error(f"Database error during availability check: {str(e)}")
         return jsonify({'message': f'Database error: {str(e)}'}), 500
 
+# local@domain.tld shape: one '@', no whitespace, a dot in the domain
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+\Z')
+
+# Stand-in hash checked when no account matches (same method/cost as real hashes)
+_DUMMY_PASSWORD_HASH = generate_password_hash(secrets.token_urlsafe(16))
+
+def _off_hub(fn, *args):
+    """Run CPU-heavy or blocking work (password hashing, disk writes) on gevent's native
+    threadpool so the hub keeps serving other greenlets. Plain threads already release the GIL."""
+    if _USE_GEVENT:
+        import gevent
+        return gevent.get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
 @app.route('/api/signup', methods=['POST'])
 def signup():
     data = request.get_json()
@@ -2357,69 +2948,43 @@ def signup():
         return jsonify({'message': 'Password must be at least 6 characters long'}), 400
     
     # Basic email validation
-    if '@' not in email or '.' not in email:
+    if not _EMAIL_RE.match(email):
         logger.warning("Signup attempt with invalid email format")
         return jsonify({'message': 'Please enter a valid email address'}), 400
 
     try:
-        conn = psycopg2.connect(**db_config)
-        conn.autocommit = True
-        cursor = conn.cursor()
-
-        # Check both username and email in a single query to avoid race conditions
-        cursor.execute("SELECT username, email FROM users WHERE username = %s OR email = %s", (username, email))
-        existing_user = cursor.fetchone()
+        hashed_password = _off_hub(generate_password_hash, password)
+        with pg_conn() as conn, conn.cursor() as cursor:
+            conn.autocommit = True
+
+            # Insert unless the username or email is taken; the unique constraints make
+            # this atomic, so there is no window between the check and the insert
+            cursor.execute(
+                "INSERT INTO users (username, email, password, created_at) VALUES (%s, %s, %s, NOW()) "
+                "ON CONFLICT DO NOTHING RETURNING id",
+                (username, email, hashed_password)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                # Only on conflict: find out which field collided for the error message
+                cursor.execute(
+                    "SELECT username = %s FROM users WHERE username = %s OR email = %s LIMIT 1",
+                    (username, username, email)
+                )
+                existing_user = cursor.fetchone()
+                if existing_user and existing_user[0]:
+                    logger.warning(f"Signup failed: Username {username} already exists")
+                    return jsonify({'message': 'Username already exists'}), 400
+                else:
+                    logger.warning(f"Signup failed: Email {email} already exists")
+                    return jsonify({'message': 'Email already exists'}), 400
+        # Per-user directories are created lazily by get_user_subdir on first use
         
-        if existing_user:
-            cursor.close()
-            conn.close()
-            if existing_user[0] == username:
-                logger.warning(f"Signup failed: Username {username} already exists")
-                return jsonify({'message': 'Username already exists'}), 400
-            else:
-                logger.warning(f"Signup failed: Email {email} already exists")
-                return jsonify({'message': 'Email already exists'}), 400
-
-        # Generate a unique username if the requested one is taken
-        base_username = username
-        counter = 1
-        while True:
-            cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
-            if not cursor.fetchone():
-                break
-            username = f"{base_username}{counter}"
-            counter += 1
-            if counter > 100:  # Prevent infinite loop
-                cursor.close()
-                conn.close()
-                logger.error("Could not generate unique username after 100 attempts")
-                return jsonify({'message': 'Unable to create account. Please try again.'}), 500
-
-        hashed_password = generate_password_hash(password)
-        cursor.execute(
-            "INSERT INTO users (username, email, password, created_at) VALUES (%s, %s, %s, %s) RETURNING id",
-            (username, email, hashed_password, datetime.now())
-        )
-        new_user_id = cursor.fetchone()[0]
-        # Prepare per-user directories
-        get_user_subdir(new_user_id, 'uploads')
-        get_user_subdir(new_user_id, 'videos')
-        get_user_subdir(new_user_id, 'trimmed')
-        cursor.close()
-        conn.close()
-        
-        if username != base_username:
-            logger.info(f"Successful signup for email: {email} with generated username: {username}")
-            return jsonify({
-                'message': f'Signup successful! Username "{base_username}" was taken, so we created "{username}" for you. Redirecting...',
-                'redirect': url_for('navigate', page='login')
-            }), 200
-        else:
-            logger.info(f"Successful signup for email: {email} with username: {username}")
-            return jsonify({
-                'message': 'Signup successful! Redirecting...',
-                'redirect': url_for('navigate', page='login')
-            }), 200
+        logger.info(f"Successful signup for email: {email} with username: {username}")
+        return jsonify({
+            'message': 'Signup successful! Redirecting...',
+            'redirect': _NAV_REDIRECTS['login']
+        }), 200
             
     except psycopg2.Error as e:
         logger.error(f"Database error during signup: {str(e)}")
@@ -2440,15 +3005,13 @@ def login():
         return jsonify({'message': 'Email and password are required'}), 400
 
     try:
-        conn = psycopg2.connect(**db_config)
-        conn.autocommit = True
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, username, password FROM users WHERE email = %s", (email,))
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if not user or not check_password_hash(user[2], password):
+        with pg_conn() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT id, username, password FROM users WHERE email = %s", (email,))
+            user = cursor.fetchone()
+
+        # Hash even for unknown emails so response time doesn't reveal which are registered
+        password_ok = _off_hub(check_password_hash, user[2] if user else _DUMMY_PASSWORD_HASH, password)
+        if not user or not password_ok:
             logger.warning(f"Failed login attempt for email: {email}")
             return jsonify({'message': 'Invalid email or password'}), 401
 
@@ -2456,7 +3019,7 @@ def login():
         session['user_id'] = user[0]
         session['username'] = user[1]
         logger.info(f"Successful login for email: {email}")
-        return jsonify({'message': 'Login successful', 'redirect': url_for('navigate', page='index')}), 200
+        return jsonify({'message': 'Login successful', 'redirect': _NAV_REDIRECTS['index']}), 200
     except psycopg2.Error as e:
         logger.error(f"Database error during login: {str(e)}")
         return jsonify({'message': f'Database error: {str(e)}'}), 500
@@ -2474,12 +3037,9 @@ def verify_email():
         return jsonify({'message': 'Email is required'}), 400
 
     try:
-        conn = psycopg2.connect(**db_config)
-        cursor = conn.cursor()
-        cursor.execute("SELECT email FROM users WHERE email = %s", (email,))
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with pg_conn() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM users WHERE email = %s LIMIT 1", (email,))
+            user = cursor.fetchone()
 
         if not user:
             logger.warning(f"Email verification failed: Email {email} not found")
@@ -2491,6 +3051,29 @@ def verify_email():
         logger.error(f"Database error during email verification: {str(e)}")
         return jsonify({'message': f'Database error: {str(e)}'}), 500
 
+# Outgoing mail runs off the request path; failures are only logged server-side
+_MAIL_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='mail')
+
+def _send_reset_email(email: str, reset_link: str, expires_at: datetime):
+    try:
+        msg = MIMEText(
+            f"Your password reset link: {reset_link}\n"
+            f"It expires at {expires_at.strftime('%Y-%m-%d %H:%M:%S')}.",
+            'plain'
+        )
+        msg['Subject'] = 'Password Reset Request - AI Auto-Posting'
+        msg['From'] = SMTP_USERNAME
+        msg['To'] = email
+
+        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+            server.starttls()
+            server.login(SMTP_USERNAME, SMTP_PASSWORD)
+            server.sendmail(SMTP_USERNAME, email, msg.as_string())
+        
+        logger.info(f"Password reset email sent to: {email}")
+    except Exception as e:
+        logger.error(f"Failed to send password reset email: {e}")
+
 @app.route('/api/forgot', methods=['POST'])
 def forgot_password():
     data = request.get_json()
@@ -2504,61 +3087,33 @@ def forgot_password():
         return jsonify({'message': 'Email is required'}), 400
 
     try:
-        conn = psycopg2.connect(**db_config)
-        cursor = conn.cursor()
-        cursor.execute("SELECT email FROM users WHERE email = %s", (email,))
-        user = cursor.fetchone()
+        token = secrets.token_urlsafe(32)
 
-        if not user:
-            cursor.close()
-            conn.close()
+        with pg_conn() as conn, conn.cursor() as cursor:
+            # Existence check and insert in a single statement; both timestamps come
+            # from the same transaction clock
+            cursor.execute(
+                "INSERT INTO password_resets (email, token, expires_at, created_at) "
+                "SELECT email, %s, NOW() + INTERVAL '1 hour', NOW() FROM users WHERE email = %s "
+                "RETURNING expires_at",
+                (token, email)
+            )
+            inserted = cursor.fetchone()
+            conn.commit()
+
+        if not inserted:
             logger.warning(f"Forgot password attempt for non-existent email: {email}")
             return jsonify({'message': 'Email not found'}), 404
+        expires_at = inserted[0]
 
-        token = secrets.token_urlsafe(32)
-        expires_at = datetime.now() + timedelta(hours=1)
-
-        cursor.execute(
-            "INSERT INTO password_resets (email, token, expires_at, created_at) VALUES (%s, %s, %s, %s)",
-            (email, token, expires_at, datetime.now())
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        sender_email = SMTP_USERNAME
-        smtp_server = SMTP_SERVER
-        smtp_port = SMTP_PORT
-        smtp_password = SMTP_PASSWORD
-
-        if all([sender_email, smtp_password]):
-            try:
-                msg = MIMEText(
-                    f"Your password reset link: {url_for('navigate', page='reset', token=token, _external=True)}\n"
-                    f"It expires at {expires_at.strftime('%Y-%m-%d %H:%M:%S')}.",
-                    'plain'
-                )
-                msg['Subject'] = 'Password Reset Request - AI Auto-Posting'
-                msg['From'] = sender_email
-                msg['To'] = email
-
-                with smtplib.SMTP(smtp_server, smtp_port) as server:
-                    server.starttls()
-                    server.login(sender_email, smtp_password)
-                    server.sendmail(sender_email, email, msg.as_string())
-                
-                logger.info(f"Password reset email sent to: {email}")
-                return jsonify({
-                    'message': 'Password reset email sent successfully. Please check your inbox.',
-                    'redirect': url_for('navigate', page='login')
-                }), 200
-                
-            except Exception as e:
-                logger.error(f"Failed to send password reset email: {e}")
-                return jsonify({
-                    'message': 'Password reset token generated but email delivery failed. Please contact support.',
-                    'token': token
-                }), 200
+        if all([SMTP_USERNAME, SMTP_PASSWORD]):
+            # Deliver in the background; the response doesn't wait on the SMTP dialog
+            reset_link = url_for('navigate', page='reset', token=token, _external=True)
+            _MAIL_POOL.submit(_send_reset_email, email, reset_link, expires_at)
+            return jsonify({
+                'message': 'Password reset email sent successfully. Please check your inbox.',
+                'redirect': _NAV_REDIRECTS['login']
+            }), 200
         else:
             # For development/demo purposes
             logger.warning("SMTP credentials not configured, returning token for demo")
@@ -2591,30 +3146,30 @@ def api_reset_password():
         return jsonify({'message': 'Passwords do not match'}), 400
 
     try:
-        conn = psycopg2.connect(**db_config)
-        cursor = conn.cursor()
-        cursor.execute("SELECT email FROM users WHERE email = %s", (email,))
-        user = cursor.fetchone()
+        hashed_password = _off_hub(generate_password_hash, new_password)
+        with pg_conn() as conn, conn.cursor() as cursor:
+            # Update the password and drop outstanding reset tokens in one round trip
+            cursor.execute(
+                """
+                WITH updated AS (
+                    UPDATE users SET password = %s WHERE email = %s RETURNING email
+                ), cleared AS (
+                    DELETE FROM password_resets WHERE email IN (SELECT email FROM updated)
+                )
+                SELECT email FROM updated
+                """,
+                (hashed_password, email)
+            )
+            user = cursor.fetchone()
+            conn.commit()
 
         if not user:
-            cursor.close()
-            conn.close()
             logger.warning(f"Reset password failed for email {email}: Email not found")
             return jsonify({'message': 'Email not found'}), 404
-
-        hashed_password = generate_password_hash(new_password)
-        cursor.execute(
-            "UPDATE users SET password = %s WHERE email = %s",
-            (hashed_password, email)
-        )
-        cursor.execute("DELETE FROM password_resets WHERE email = %s", (email,))
-        conn.commit()
-        cursor.close()
-        conn.close()
         logger.info(f"Password reset successful for email: {email}")
         return jsonify({
             'message': 'Password reset successfully',
-            'redirect': url_for('navigate', page='login')
+            'redirect': _NAV_REDIRECTS['login']
         }), 200
     except psycopg2.Error as e:
         logger.error(f"Database error during reset password: {str(e)}")
@@ -2625,7 +3180,7 @@ def logout():
     email = session.get('user', 'unknown')
     session.pop('user', None)
     logger.info(f"User logged out: {email}")
-    return jsonify({'message': 'Logged out successfully', 'redirect': url_for('navigate', page='index')}), 200
+    return jsonify({'message': 'Logged out successfully', 'redirect': _NAV_REDIRECTS['index']}), 200
 
 @app.route('/api/transcribe', methods=['POST'])
 def transcribe_audio():
@@ -2634,6 +3189,10 @@ def transcribe_audio():
         if 'file' not in request.files:
             return jsonify({'success': False, 'error': 'No file uploaded'}), 400
         
+        files = request.files.getlist('file')
+        if len(files) > 1:
+            return _transcribe_many(files)
+        
         file = request.files['file']
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No file selected'}), 400
@@ -2644,110 +3203,107 @@ def transcribe_audio():
         # Save uploaded file temporarily
         filename = secure_filename(file.filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        file.save(file_path, buffer_size=_UPLOAD_COPY_BUFSIZE)
         
-        try:
-            # Generate transcript
-            if file.filename.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm')):
-                result = generate_transcript_from_video(file_path)
-            elif file.filename.lower().endswith(('.txt', '.doc', '.docx', '.pdf')):
-                # Handle text files
+        # Generate transcript (classify on the client's name: secure_filename can drop the dot)
+        ext = _file_ext(file.filename)
+        if ext in _TEXT_DOC_EXTS:
+            # Handle text files
+            try:
                 result = process_text_file(file_path)
-            else:
-                result = generate_transcript_from_audio(file_path)
-            
-            # Clean up uploaded file
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            
-            return jsonify(result)
-            
-        except Exception as e:
-            # Clean up uploaded file on error
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            raise e
+            finally:
+                _remove_quietly(file_path)
+        else:
+            fn = generate_transcript_from_video if ext in _MEDIA_VIDEO_EXTS else generate_transcript_from_audio
+            # Removes file_path itself once the job is done with it
+            result = _run_transcription(fn, file_path)
+        
+        return jsonify(result), (504 if result.get('method') == 'timeout' else 200)
             
     except Exception as e:
         logger.error(f"Error in transcribe endpoint: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/generate_story', methods=['POST'])
-def generate_story():
-    """Generate story content using Google Gemini AI with Lucy's voiceover script format"""
+def _transcribe_many(files):
+    """Multi-file upload: one pool job per file, so files transcribe in parallel and time out independently."""
+    for f in files:
+        if not f.filename or not allowed_file(f.filename) or _file_ext(f.filename) in _TEXT_DOC_EXTS:
+            return jsonify({'success': False, 'error': f'File type not supported: {f.filename}'}), 400
+    jobs = []
     try:
-        # Debug: Log the raw request
-        logger.info(f"Story generation request received")
-        logger.info(f"Request method: {request.method}")
-        logger.info(f"Request headers: {dict(request.headers)}")
-        logger.info(f"Request content type: {request.content_type}")
-        
-        # Try to get JSON data
-        try:
-            data = request.get_json()
-            logger.info(f"Parsed JSON data: {data}")
-        except Exception as json_error:
-            logger.error(f"Failed to parse JSON: {json_error}")
-            # Try to get form data as fallback
-            data = request.form.to_dict()
-            logger.info(f"Using form data as fallback: {data}")
-        
-        if not data:
-            logger.warning("Story generation attempt with no data")
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
-        
-        # Extract transcript/content
-        transcript = data.get('text') if isinstance(data, dict) else None
-        
-        # Fallback to old prompt format if text is not provided
-        if not transcript:
-            prompt = None
-            if isinstance(data, dict):
-                prompt = data.get('prompt') or data.get('message')
-            elif isinstance(data, str):
-                prompt = data
-            
-            if not prompt:
-                logger.warning(f"Story generation attempt with missing content. Data received: {data}")
-                return jsonify({'success': False, 'error': 'No content provided. Please send text or prompt in the request.'}), 400
-            
-            transcript = prompt
-            logger.info(f"Story generation request received with prompt: {transcript[:100]}...")
-        else:
-            logger.info(f"Story generation request received with transcript: {transcript[:100]}...")
-        
-        # Check if model is available
-        if not model:
-            logger.error("Google Gemini AI model not available")
-            return jsonify({'success': False, 'error': 'AI model not available. Please check GOOGLE_API_KEY configuration.'}), 500
-        
-        logger.info("Google Gemini AI model is available, proceeding with generation...")
-        
-        try:
-            # Extract framing and story from transcript
-            framing, story = extract_framing_and_story(transcript)
-            
-            # Get format and custom prompt from request
-            story_format = data.get('format', 'lucy')
-            use_custom_prompt = data.get('useCustomPrompt', False)
-            custom_prompt = data.get('customPrompt', '')
-
-            # Create prompt based on format and custom input
-            if use_custom_prompt and custom_prompt.strip():
-                # Use custom prompt provided by user
-                prompt = f"""
-{custom_prompt}
+        for f in files:
+            # Unique temp names: secure_filename() can map different uploads to the same name
+            ext = _file_ext(f.filename)
+            path = os.path.join(app.config['UPLOAD_FOLDER'], uuid.uuid4().hex + ext)
+            f.save(path, buffer_size=_UPLOAD_COPY_BUFSIZE)
+            fn = generate_transcript_from_video if ext in _MEDIA_VIDEO_EXTS else generate_transcript_from_audio
+            jobs.append((fn, path))
+    except Exception:
+        for _, path in jobs:
+            _remove_quietly(path)
+        raise
+    futures = [_submit_transcription(fn, path) for fn, path in jobs]
+    results = []
+    try:
+        for future, (fn, path) in zip(futures, jobs):
+            results.append(_finish_transcription(future, fn, path))
+    finally:
+        # Only reached early on an exception; the finished jobs already released their files
+        for future, (_, path) in list(zip(futures, jobs))[len(results) + 1:]:
+            _release_upload(future, path)
+    return jsonify({'success': True, 'results': [dict(r, filename=f.filename) for r, f in zip(results, files)]})
+
+def _compile_prompt(template: str) -> tuple:
+    """Split a {field}-style prompt template once into (literal, field) chunks."""
+    return tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+
+def _render_prompt(parts: tuple, **values) -> str:
+    # One join over the pre-split chunks instead of re-parsing the multi-KB template per call
+    out = []
+    for literal, field in parts:
+        out.append(literal)
+        if field is not None:
+            out.append(str(values[field]))
+    return ''.join(out)
+
+# Gemini replies keyed by sha256 of the full prompt; retries and double-fired requests skip the round-trip
+_GEMINI_MEMO: dict[str, tuple] = {}
+_GEMINI_MEMO_SIZE = 1024
+# A dedupe window only: pressing Generate again later must still produce a fresh story
+_GEMINI_MEMO_TTL = 60
+_GEMINI_MEMO_LOCK = threading.Lock()
+
+def _gemini_memo_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+def _gemini_memo_get(key: str) -> str | None:
+    with _GEMINI_MEMO_LOCK:
+        hit = _GEMINI_MEMO.pop(key, None)
+        if hit and hit[0] > time.monotonic():
+            _GEMINI_MEMO[key] = hit  # re-insert as most recently used
+            return hit[1]
+    return None
 
-Input Content:
-{framing}
-{story}
+def _gemini_memo_put(key: str, text: str):
+    if not text:
+        return
+    with _GEMINI_MEMO_LOCK:
+        _GEMINI_MEMO[key] = (time.monotonic() + _GEMINI_MEMO_TTL, text)
+        while len(_GEMINI_MEMO) > _GEMINI_MEMO_SIZE:
+            _GEMINI_MEMO.pop(next(iter(_GEMINI_MEMO)))
+
+def _generate_text(prompt: str) -> str:
+    """model.generate_content(prompt).text, served from memory for repeated prompts."""
+    key = _gemini_memo_key(prompt)
+    text = _gemini_memo_get(key)
+    if text is None:
+        response = model.generate_content(prompt)
+        text = response.text if response else ''
+        _gemini_memo_put(key, text)
+    return text
 
-Please generate a story based on the above custom prompt and input content.
-"""
-            else:
-                # Use predefined format prompts
-                if story_format == 'lucy':
-                    prompt = f"""
+# Story-generation prompts by format; rendered with framing=..., story=...
+_STORY_PROMPT_LUCY = """
 You are a professional story design assistant creating a voiceover script for Lucy from "Lucy & The Wealth Machine."
 
 Input:
@@ -2846,8 +3402,7 @@ Ready to master video hooks? Let's build your system together. Visit [website] t
 **FINAL INSTRUCTION: Generate clean, readable output without any markdown formatting symbols. Use only quotes, emojis, and proper line breaks.**
 """
 
-                elif story_format == 'narrative':
-                    prompt = f"""
+_STORY_PROMPT_NARRATIVE = """
 You are a creative storytelling assistant creating engaging narrative stories.
 
 Input:
@@ -2907,8 +3462,7 @@ The garden waited, its magic pulsing with anticipation.
 **CRITICAL: Ensure proper line breaks and spacing throughout the entire story. Do not compress the text together.**
 """
 
-                elif story_format == 'business':
-                    prompt = f"""
+_STORY_PROMPT_BUSINESS = """
 You are a professional business content creator specializing in case studies and business storytelling.
 
 Input:
@@ -2994,8 +3548,7 @@ Company X's digital transformation demonstrates that traditional businesses can
 **CRITICAL: Ensure proper line breaks and spacing throughout the entire case study. Do not compress the text together.**
 """
 
-                elif story_format == 'motivational':
-                    prompt = f"""
+_STORY_PROMPT_MOTIVATIONAL = """
 You are a motivational speaker and life coach creating inspiring, action-oriented content.
 
 Input:
@@ -3080,127 +3633,101 @@ Your Call to Action
 **CRITICAL: Ensure proper line breaks and spacing throughout the entire speech. Do not compress the text together.**
 """
 
-                else:
-                    # Default to Lucy format
-                    prompt = f"""
-You are a professional story design assistant creating a voiceover script for Lucy from "Lucy & The Wealth Machine."
-
-Input:
-- Framing: "{framing}"
-- Story: "{story}"
-
-Task: Create a professional 4-part voiceover script with CLEAN FORMATTING and PROPER LINE BREAKS.
-
-CRITICAL: You MUST include line breaks between every section. The output must be properly formatted with spacing.
-
-EXACT FORMAT EXAMPLE - Copy this structure precisely:
-
-Lucy & The Wealth Machine: The Psychology of Viral Video Openings
-
-Core Lessons:
-- Three-step hook: Context Lean, Scroll Stop Interjection, Contrarian Snapback
-- Visual hooks: Combine text and motion
-- Build common ground with cultural references
-- Compress value with short sentences
-
-🎬 The Hook That Almost Didn't Work
-
-"Today: video hooks. Want better videos? Better hooks."
-"Forget lists of viral hooks."
-"Understand the psychology."
-
-"Hi, I'm Lucy. A million followers, billions of views. I learned video hooks the hard way. Catchy phrases? Nope. It's about a curiosity loop—instant attention. My three-step formula works every time. But first, a hook that nearly flopped…"
-
-"What's your biggest video intro mistake? Let me know!"
-
-
-🎬 The Three-Step Formula
-
-"Context lean. Scroll stop. Contrarian snapback."
-"It's not about being clever."
-"It's about being strategic."
-
-"The psychology is simple: grab attention, create curiosity, deliver value. I tested this formula across thousands of videos. The results? Consistent engagement, predictable growth, sustainable success."
-
-"Which step do you struggle with most?"
-
-
-🎬 Visual Hooks That Convert
-
-"Text plus motion equals magic."
-"Your hook needs to move."
-"Literally."
-
-"I discovered that combining bold text with subtle motion increases retention by 40%. It's not about fancy effects—it's about guiding the viewer's eye to your key message."
-
-"What's your favorite visual hook technique?"
-
-
-🎬 Building Your Hook System
-
-"Systems beat strategies every time."
-"Create your hook framework."
-"Then scale it."
-
-"I built a hook system that works across all platforms. Same psychology, different execution. Now my team can create engaging content consistently, without guesswork."
-
-"Ready to build your own hook system?"
-
-
-Ready to master video hooks? Let's build your system together. Visit [website] to start.
-
----
-
-**MANDATORY FORMATTING REQUIREMENTS:**
-
-1. **ALWAYS start with a blank line after the title**
-2. **ALWAYS include line breaks between Core Lessons and first segment**
-3. **ALWAYS include line breaks before and after each segment title**
-4. **ALWAYS include line breaks between segments (no CUT markers)**
-5. **ALWAYS include line breaks before Final CTA**
-6. **DO NOT use markdown symbols like #, **, or >**
-7. **ALWAYS use quotes around dialogue**
-8. **ALWAYS maintain consistent spacing throughout**
+_STORY_PROMPTS = {
+    'lucy': _compile_prompt(_STORY_PROMPT_LUCY),
+    'narrative': _compile_prompt(_STORY_PROMPT_NARRATIVE),
+    'business': _compile_prompt(_STORY_PROMPT_BUSINESS),
+    'motivational': _compile_prompt(_STORY_PROMPT_MOTIVATIONAL),
+}
 
-**STRUCTURE REQUIREMENTS:**
-- Title (no markdown symbols)
-- Core Lessons section with bullet points
-- 4 segments with 🎬 titles
-- Each segment has 3 quoted hooks, main content, and question
-- No CUT markers - flow directly from one segment to the next
-- Final call-to-action content at the end (no label)
+def _build_story_prompt(data: dict, transcript: str) -> str:
+    # Extract framing and story from transcript
+    framing, story = extract_framing_and_story(transcript)
+    
+    # Get format and custom prompt from request
+    story_format = data.get('format', 'lucy')
+    use_custom_prompt = data.get('useCustomPrompt', False)
+    custom_prompt = data.get('customPrompt', '')
+
+    # Create prompt based on format and custom input
+    if use_custom_prompt and custom_prompt.strip():
+        # Use custom prompt provided by user
+        return f"""
+{custom_prompt}
 
-**TONE REQUIREMENTS:**
-- Calm, confident, informative, slightly playful, British, non-salesy
-- Use Lucy's authentic voice
-- Short sentences, avoid filler words
-- Each segment ends with an engaging question
+Input Content:
+{framing}
+{story}
 
-**CRITICAL: Ensure proper line breaks and spacing throughout the entire script. Do not compress the text together.**
+Please generate a story based on the above custom prompt and input content.
+"""
+    # Use predefined format prompts; unknown formats default to Lucy
+    template = _STORY_PROMPTS.get(story_format, _STORY_PROMPTS['lucy'])
+    return _render_prompt(template, framing=framing, story=story)
+
+def _story_response(generated: str) -> dict:
+    """Clean, format and parse raw Gemini story text into the generate_story payload."""
+    logger.info(f"Generated content length: {len(generated)} characters")
+    story_text = generated.strip()
+    clean_story = clean_lucy_story(story_text)
+    universal_story = format_story_universal(clean_story)
+    
+    # Parse the story into structured format for frontend compatibility
+    parsed_story = parse_story_to_json(universal_story)
+    
+    logger.info(f"Story parsed successfully. Title: {parsed_story.get('title', 'No title')}, Word count: {parsed_story.get('word_count', 'Unknown')}")
+    
+    return {
+        'success': True,
+        'story': parsed_story,
+        'raw_response': universal_story
+    }
 
-**FINAL INSTRUCTION: Generate clean, readable output without any markdown formatting symbols. Use only quotes, emojis, and proper line breaks.**
-"""
+@app.route('/api/generate_story', methods=['POST'])
+def generate_story():
+    """Generate story content using Google Gemini AI with Lucy's voiceover script format"""
+    try:
+        logger.info("Story generation request received")
+        
+        data = _story_request_payload()
+        if logger.isEnabledFor(logging.DEBUG):
+            # Raw request details (headers include cookies) only at DEBUG
+            logger.debug("Request %s %s, headers: %s, data: %s",
+                         request.method, request.content_type, request.headers, data)
+        
+        if not data:
+            logger.warning("Story generation attempt with no data")
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        # Extract transcript/content
+        transcript = data.get('text')
+        
+        # Fallback to old prompt format if text is not provided
+        if not transcript:
+            prompt = data.get('prompt') or data.get('message')
             
-            response = model.generate_content(prompt)
+            if not prompt:
+                logger.warning(f"Story generation attempt with missing content. Data received: {data}")
+                return jsonify({'success': False, 'error': 'No content provided. Please send text or prompt in the request.'}), 400
             
-            logger.info(f"Received response from Gemini: {type(response)}")
+            transcript = prompt
+            logger.info(f"Story generation request received with prompt: {transcript[:100]}...")
+        else:
+            logger.info(f"Story generation request received with transcript: {transcript[:100]}...")
+        
+        # Check if model is available
+        if not model:
+            logger.error("Google Gemini AI model not available")
+            return jsonify({'success': False, 'error': 'AI model not available. Please check GOOGLE_API_KEY configuration.'}), 500
+        
+        logger.info("Google Gemini AI model is available, proceeding with generation...")
+        
+        try:
+            prompt = _build_story_prompt(data, transcript)
+            generated = _generate_text(prompt)
             
-            if response and hasattr(response, 'text') and response.text:
-                logger.info(f"Generated content length: {len(response.text)} characters")
-                story_text = response.text.strip()
-                clean_story = clean_lucy_story(story_text)
-                universal_story = format_story_universal(clean_story)
-                
-                # Parse the story into structured format for frontend compatibility
-                parsed_story = parse_story_to_json(universal_story)
-                
-                logger.info(f"Story parsed successfully. Title: {parsed_story.get('title', 'No title')}, Word count: {parsed_story.get('word_count', 'Unknown')}")
-                
-                return jsonify({
-                    'success': True,
-                    'story': parsed_story,
-                    'raw_response': universal_story
-                })
+            if generated:
+                return jsonify(_story_response(generated))
             else:
                 logger.warning("Gemini response is empty or invalid")
                 return jsonify({'success': False, 'error': 'No response from AI model. Response was empty or invalid.'}), 500
@@ -3213,6 +3740,44 @@ Ready to master video hooks? Let's build your system together. Visit [website] t
         logger.error(f"Error in generate_story endpoint: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/generate_story/stream', methods=['POST'])
+def generate_story_stream():
+    """Server-sent events variant of generate_story: text deltas as Gemini produces them, then the parsed story."""
+    data = _story_request_payload()
+    transcript = data.get('text') or data.get('prompt') or data.get('message')
+    if not transcript:
+        return jsonify({'success': False, 'error': 'No content provided. Please send text or prompt in the request.'}), 400
+    if not model:
+        logger.error("Google Gemini AI model not available")
+        return jsonify({'success': False, 'error': 'AI model not available. Please check GOOGLE_API_KEY configuration.'}), 500
+    
+    def generate():
+        try:
+            prompt = _build_story_prompt(data, transcript)
+            key = _gemini_memo_key(prompt)
+            generated = _gemini_memo_get(key)
+            if generated is None:
+                parts = []
+                for chunk in model.generate_content(prompt, stream=True):
+                    text = chunk.text
+                    if text:
+                        parts.append(text)
+                        yield f"data: {json.dumps({'delta': text})}\n\n"
+                generated = ''.join(parts)
+                _gemini_memo_put(key, generated)
+            else:
+                yield f"data: {json.dumps({'delta': generated})}\n\n"
+            if not generated:
+                yield f"data: {json.dumps({'success': False, 'done': True, 'error': 'No response from AI model. Response was empty or invalid.'})}\n\n"
+                return
+            yield f"data: {json.dumps(dict(_story_response(generated), done=True))}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming story from Gemini: {str(e)}")
+            yield f"data: {json.dumps({'success': False, 'done': True, 'error': f'AI generation failed: {str(e)}'})}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/upload-file', methods=['POST'])
 def upload_file():
     """Upload audio/video file for transcription"""
@@ -3230,7 +3795,7 @@ def upload_file():
         # Save uploaded file
         filename = secure_filename(file.filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        file.save(file_path, buffer_size=_UPLOAD_COPY_BUFSIZE)
         
         return jsonify({
             'success': True,
@@ -3243,6 +3808,23 @@ def upload_file():
         logger.error(f"Error in upload_file endpoint: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _context_clues_text(context_keywords) -> str:
+    return ', '.join(context_keywords) if context_keywords else 'No specific context detected'
+
+# Chatbot prompt; rendered with query=...
+_CHAT_PROMPT = _compile_prompt("""
+You are an AI assistant for StoryVerse, a content creation platform. You help users with:
+
+1. **Story Generation**: Help users create compelling stories, scripts, and content
+2. **Video Creation**: Guide users on video production, editing, and optimization
+3. **Content Strategy**: Provide tips on content planning, audience engagement, and platform optimization
+4. **Technical Support**: Help with using the platform's features and tools
+
+User Query: {query}
+
+Please provide a helpful, concise response in 2-4 sentences. Be friendly, knowledgeable, and specific to content creation and storytelling. If the user asks about features, mention that they can use the story generation tools, video clipping features, or other platform capabilities.
+""")
+
 @app.route('/api/gemini_chat', methods=['POST'])
 def gemini_chat():
     """Chat endpoint using Google Gemini AI"""
@@ -3251,7 +3833,8 @@ def gemini_chat():
         if not data or 'query' not in data:
             return jsonify({'success': False, 'error': 'No query provided'}), 400
         
-        query = data['query']
+        # Collapse whitespace so retyped/pasted variants of a question share a cache entry
+        query = ' '.join(data['query'].split())
         logger.info(f"Chat request received: {query[:100]}...")
         
         # Check if model is available
@@ -3261,24 +3844,13 @@ def gemini_chat():
         
         try:
             # Create context-aware prompt for better responses
-            context_prompt = f"""
-You are an AI assistant for StoryVerse, a content creation platform. You help users with:
-
-1. **Story Generation**: Help users create compelling stories, scripts, and content
-2. **Video Creation**: Guide users on video production, editing, and optimization
-3. **Content Strategy**: Provide tips on content planning, audience engagement, and platform optimization
-4. **Technical Support**: Help with using the platform's features and tools
-
-User Query: {query}
-
-Please provide a helpful, concise response in 2-4 sentences. Be friendly, knowledgeable, and specific to content creation and storytelling. If the user asks about features, mention that they can use the story generation tools, video clipping features, or other platform capabilities.
-"""
+            context_prompt = _render_prompt(_CHAT_PROMPT, query=query)
             
             # Generate response using Gemini
-            response = model.generate_content(context_prompt)
+            generated = _generate_text(context_prompt)
             
-            if response and hasattr(response, 'text') and response.text:
-                bot_response = response.text.strip()
+            if generated:
+                bot_response = generated.strip()
                 logger.info(f"Chat response generated successfully: {len(bot_response)} characters")
                 
                 return jsonify({
@@ -3301,25 +3873,14 @@ Please provide a helpful, concise response in 2-4 sentences. Be friendly, knowle
 def health_check():
     """Health check endpoint to verify server and ffmpeg availability"""
     try:
-        # Check if ffmpeg is available
-        ffmpeg_available = False
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True, timeout=10)
-            ffmpeg_available = True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            ffmpeg_available = False
-        
-        # Check if required directories exist
-        # Basic fs checks
-        directories = {
-            'static': os.path.exists('static'),
-        }
+        # Cached probe; no fork+exec per health poll
+        ffmpeg_available = _ffmpeg_available()
         
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'ffmpeg_available': ffmpeg_available,
-            'directories': directories,
+            'directories': dict(_BOOT_DIRECTORIES),
             'message': 'Server is running'
         })
         
@@ -3331,30 +3892,16 @@ def health_check():
             'error': str(e)
         }), 500
 
-@app.route('/api/generate_caption', methods=['POST'])
-def generate_caption():
-    """Generate caption and title for a video using Gemini AI"""
-    try:
-        data = request.get_json()
-        if not data or 'filename' not in data:
-            return jsonify({'success': False, 'error': 'Filename is required'}), 400
-        
-        filename = data['filename']
-        
-        # Extract video information from filename
-        video_name = os.path.splitext(filename)[0]
-        
-        # Analyze filename for context clues
-        context_keywords = analyze_filename_for_context(video_name)
-        
-        # Generate professional title first
-        title = generate_professional_title(video_name)
-        
-        # Generate engaging caption using Gemini AI
-        prompt = f"""
+# Used when Gemini is unavailable or its reply can't be parsed
+_FALLBACK_TITLE = "Amazing Content You Need to See"
+_FALLBACK_CAPTION = "🎬 This moment changed everything... The story you need to see right now! 💫 This is the kind of content that goes viral because it's authentic, powerful, and speaks to everyone. What's your take on this incredible journey? Drop your thoughts below and let's start a conversation! 👇✨"
+_FALLBACK_HASHTAGS = "#viral #trending #fyp #foryou #shorts #reels #viralvideo #trendingnow #mustwatch #amazing #inspiration #life #motivation #storytime #inspiring #viralcontent #trendingvideo #fypシ #viralpost #trendingpost"
+
+# Caption prompt; rendered with title=..., context=...
+_CAPTION_PROMPT = _compile_prompt("""
         Generate a professional, comprehensive social media caption for a video titled "{title}".
         
-        Context clues from filename: {', '.join(context_keywords) if context_keywords else 'No specific context detected'}
+        Context clues from filename: {context}
         
         CRITICAL REQUIREMENTS:
         1. Create a professional, complete caption that tells a compelling story (500-800 characters)
@@ -3380,11 +3927,32 @@ def generate_caption():
         
         Make the caption professional, complete, and valuable - something that would be used in a real social media post.
         Use the context clues to make the caption more relevant and specific to the actual content.
-        """
+        """)
+
+@app.route('/api/generate_caption', methods=['POST'])
+def generate_caption():
+    """Generate caption and title for a video using Gemini AI"""
+    try:
+        data = request.get_json()
+        if not data or 'filename' not in data:
+            return jsonify({'success': False, 'error': 'Filename is required'}), 400
+        
+        filename = data['filename']
+        
+        # Extract video information from filename
+        video_name = os.path.splitext(filename)[0]
+        
+        # Analyze filename for context clues
+        context_keywords = analyze_filename_for_context(video_name)
+        
+        # Generate professional title first
+        title = generate_professional_title(video_name)
+        
+        # Generate engaging caption using Gemini AI
+        prompt = _render_prompt(_CAPTION_PROMPT, title=title, context=_context_clues_text(context_keywords))
         
         try:
-            response = model.generate_content(prompt)
-            content = response.text
+            content = _generate_text(prompt)
             
             # Parse the response to extract caption and hashtags
             lines = content.split('\n')
@@ -3399,10 +3967,10 @@ def generate_caption():
             
             # If parsing failed, create a fallback
             if not caption:
-                caption = "🎬 This moment changed everything... The story you need to see right now! 💫 This is the kind of content that goes viral because it's authentic, powerful, and speaks to everyone. What's your take on this incredible journey? Drop your thoughts below and let's start a conversation! 👇✨"
+                caption = _FALLBACK_CAPTION
             
             if not hashtags:
-                hashtags = "#viral #trending #fyp #foryou #shorts #reels #viralvideo #trendingnow #mustwatch #amazing #inspiration #life #motivation #storytime #inspiring #viralcontent #trendingvideo #fypシ #viralpost #trendingpost"
+                hashtags = _FALLBACK_HASHTAGS
             
             return jsonify({
                 'success': True,
@@ -3415,8 +3983,8 @@ def generate_caption():
         except Exception as e:
             logging.error(f"Gemini AI error: {e}")
             # Fallback caption generation
-            fallback_caption = "🎬 This moment changed everything... The story you need to see right now! 💫 This is the kind of content that goes viral because it's authentic, powerful, and speaks to everyone. What's your take on this incredible journey? Drop your thoughts below and let's start a conversation! 👇✨"
-            fallback_hashtags = "#viral #trending #fyp #foryou #shorts #reels #viralvideo #trendingnow #mustwatch #amazing #inspiration #life #motivation #storytime #inspiring #viralcontent #trendingvideo #fypシ #viralpost #trendingpost"
+            fallback_caption = _FALLBACK_CAPTION
+            fallback_hashtags = _FALLBACK_HASHTAGS
             
             return jsonify({
                 'success': True,
@@ -3430,6 +3998,62 @@ def generate_caption():
         logging.error(f"Error generating caption: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Title, caption and hashtags in one structured reply; rendered with video_name=..., context=..., random_seed=...
+_METADATA_PROMPT = _compile_prompt("""
+        Generate YouTube and social media metadata for a video with filename "{video_name}".
+        
+        Context clues from filename: {context}
+        Random seed for variety: {random_seed}
+        
+        Return a JSON object with exactly these string fields:
+        - "title": a professional, compelling, SEO-friendly title of EXACTLY 5-6 words. Avoid clickbait and do not reference the filename.
+        - "caption": a professional, comprehensive social media caption (500-800 characters) that tells a compelling story, uses emojis strategically, ends with a clear call-to-action, and does not mention the filename or technical details.
+        - "hashtags": 15-20 space-separated trending hashtags relevant to the content, including famous ones like #viral, #trending, #fyp, #foryou, #shorts, #reels.
+        
+        Use the context clues to make the metadata specific to the actual content.
+        """)
+_JSON_GENERATION_CONFIG = genai.GenerationConfig(response_mime_type='application/json')
+
+@app.route('/api/generate_metadata', methods=['POST'])
+def generate_metadata():
+    """Generate title, caption and hashtags for a video with a single Gemini call"""
+    try:
+        data = request.get_json()
+        if not data or 'filename' not in data:
+            return jsonify({'success': False, 'error': 'Filename is required'}), 400
+        
+        filename = data['filename']
+        video_name = os.path.splitext(filename)[0]
+        context_keywords = analyze_filename_for_context(video_name)
+        prompt = _render_prompt(_METADATA_PROMPT, video_name=video_name,
+                                context=_context_clues_text(context_keywords),
+                                random_seed=random.randint(1, 1000))
+        
+        try:
+            response = model.generate_content(prompt, generation_config=_JSON_GENERATION_CONFIG)
+            metadata = json.loads(response.text)
+            if not isinstance(metadata, dict):
+                metadata = {}
+        except Exception as e:
+            logging.error(f"Gemini metadata error: {e}")
+            metadata = {}
+        
+        hashtags = metadata.get('hashtags') or _FALLBACK_HASHTAGS
+        if isinstance(hashtags, list):
+            hashtags = ' '.join(map(str, hashtags))
+        
+        return jsonify({
+            'success': True,
+            'title': _fit_title_words(str(metadata.get('title') or '').strip()),
+            'caption': str(metadata.get('caption') or '').strip() or _FALLBACK_CAPTION,
+            'hashtags': str(hashtags).strip(),
+            'filename': filename
+        })
+        
+    except Exception as e:
+        logging.error(f"Error generating metadata: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/generate_title', methods=['POST'])
 def generate_title():
     """Generate professional title for a video using Gemini AI"""
@@ -3482,20 +4106,11 @@ def regenerate_title():
         logging.error(f"Error regenerating title: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-def generate_professional_title(video_name):
-    """Generate a professional title for YouTube using Gemini AI - 5-6 words, different each time"""
-    try:
-        # Analyze filename for context clues
-        context_keywords = analyze_filename_for_context(video_name)
-        
-        # Add random seed for variety
-        import random
-        random_seed = random.randint(1, 1000)
-        
-        prompt = f"""
+# Title prompt; rendered with video_name=..., context=..., random_seed=...
+_TITLE_PROMPT = _compile_prompt("""
         Generate a professional, engaging YouTube video title for a video with filename "{video_name}".
         
-        Context clues from filename: {', '.join(context_keywords) if context_keywords else 'No specific context detected'}
+        Context clues from filename: {context}
         Random seed for variety: {random_seed}
         
         CRITICAL REQUIREMENTS:
@@ -3521,10 +4136,21 @@ def generate_professional_title(video_name):
         - "What Nobody Tells You About"
         
         Make the title feel professional and authentic, optimized for YouTube's platform.
-        """
+        """)
+
+def generate_professional_title(video_name):
+    """Generate a professional title for YouTube using Gemini AI - 5-6 words, different each time"""
+    try:
+        # Analyze filename for context clues
+        context_keywords = analyze_filename_for_context(video_name)
         
-        response = model.generate_content(prompt)
-        content = response.text
+        # Add random seed for variety
+        import random
+        random_seed = random.randint(1, 1000)
+        
+        prompt = _render_prompt(_TITLE_PROMPT, video_name=video_name, context=_context_clues_text(context_keywords), random_seed=random_seed)
+        
+        content = _generate_text(prompt)
         
         # Parse the response to extract title
         lines = content.split('\n')
@@ -3535,77 +4161,68 @@ def generate_professional_title(video_name):
                 title = line.replace('Title:', '').strip()
                 break
         
-        # If parsing failed, create a fallback
-        if not title:
-            title = "Amazing Content You Need to See"
-        
-        # Ensure title is 5-6 words
-        words = title.split()
-        if len(words) > 6:
-            title = ' '.join(words[:6])
-        elif len(words) < 5:
-            # Add words to make it 5-6 words
-            fallback_words = ["Amazing", "Content", "You", "Need", "To", "See"]
-            title = ' '.join(words + fallback_words[:5-len(words)])
-        
-        return title
+        return _fit_title_words(title)
         
     except Exception as e:
         logging.error(f"Title generation error: {e}")
         # Fallback title
-        return "Amazing Content You Need to See"
+        return _FALLBACK_TITLE
+
+def _fit_title_words(title: str) -> str:
+    """Fallback for an empty title, then trim or pad it to 5-6 words."""
+    # If parsing failed, create a fallback
+    if not title:
+        title = _FALLBACK_TITLE
+    
+    # Ensure title is 5-6 words
+    words = title.split()
+    if len(words) > 6:
+        title = ' '.join(words[:6])
+    elif len(words) < 5:
+        # Add words to make it 5-6 words
+        fallback_words = ["Amazing", "Content", "You", "Need", "To", "See"]
+        title = ' '.join(words + fallback_words[:5-len(words)])
+    return title
+
+# Filename context clues, checked in this order; substring match so run-together names ("myfunnyvlog") still hit
+_FILENAME_CONTENT_TYPES = (
+    ('tutorial', ('tutorial', 'howto', 'guide', 'learn', 'education', 'teaching')),
+    ('story', ('story', 'narrative', 'tale', 'journey', 'experience')),
+    ('funny', ('funny', 'humor', 'comedy', 'laugh', 'joke', 'hilarious')),
+    ('inspirational', ('inspiration', 'motivation', 'success', 'achievement', 'goal')),
+    ('behind_scenes', ('behind', 'scenes', 'making', 'process', 'workflow')),
+    ('review', ('review', 'analysis', 'opinion', 'thoughts', 'feedback')),
+    ('challenge', ('challenge', 'dare', 'test', 'trial', 'experiment')),
+    ('transformation', ('transformation', 'change', 'before', 'after', 'progress')),
+    ('travel', ('travel', 'adventure', 'explore', 'journey', 'trip')),
+    ('food', ('food', 'cooking', 'recipe', 'meal', 'cuisine')),
+    ('fitness', ('fitness', 'workout', 'exercise', 'health', 'training')),
+    ('music', ('music', 'song', 'performance', 'concert', 'band')),
+    ('art', ('art', 'creative', 'design', 'painting', 'drawing')),
+    ('tech', ('tech', 'technology', 'gadget', 'app', 'software')),
+    ('business', ('business', 'entrepreneur', 'startup', 'success', 'money')),
+)
+# Emotional, time and location indicators, reported as the word itself
+_FILENAME_CONTEXT_WORDS = (
+    'amazing', 'incredible', 'unbelievable', 'shocking', 'surprising', 'beautiful', 'stunning', 'epic', 'legendary',
+    'today', 'yesterday', 'morning', 'night', 'weekend', 'holiday', 'birthday', 'anniversary',
+    'home', 'office', 'gym', 'park', 'beach', 'city', 'country', 'world',
+)
 
 def analyze_filename_for_context(filename):
     """Analyze filename to extract context clues for better caption generation"""
-    context_keywords = []
-    
-    # Convert to lowercase for analysis
     filename_lower = filename.lower()
     
-    # Common video content indicators
-    content_types = {
-        'tutorial': ['tutorial', 'howto', 'guide', 'learn', 'education', 'teaching'],
-        'story': ['story', 'narrative', 'tale', 'journey', 'experience'],
-        'funny': ['funny', 'humor', 'comedy', 'laugh', 'joke', 'hilarious'],
-        'inspirational': ['inspiration', 'motivation', 'success', 'achievement', 'goal'],
-        'behind_scenes': ['behind', 'scenes', 'making', 'process', 'workflow'],
-        'review': ['review', 'analysis', 'opinion', 'thoughts', 'feedback'],
-        'challenge': ['challenge', 'dare', 'test', 'trial', 'experiment'],
-        'transformation': ['transformation', 'change', 'before', 'after', 'progress'],
-        'travel': ['travel', 'adventure', 'explore', 'journey', 'trip'],
-        'food': ['food', 'cooking', 'recipe', 'meal', 'cuisine'],
-        'fitness': ['fitness', 'workout', 'exercise', 'health', 'training'],
-        'music': ['music', 'song', 'performance', 'concert', 'band'],
-        'art': ['art', 'creative', 'design', 'painting', 'drawing'],
-        'tech': ['tech', 'technology', 'gadget', 'app', 'software'],
-        'business': ['business', 'entrepreneur', 'startup', 'success', 'money']
-    }
-    
-    # Check for content type matches
-    for content_type, keywords in content_types.items():
-        if any(keyword in filename_lower for keyword in keywords):
-            context_keywords.append(content_type)
-    
-    # Check for emotional indicators
-    emotional_words = ['amazing', 'incredible', 'unbelievable', 'shocking', 'surprising', 'beautiful', 'stunning', 'epic', 'legendary']
-    for word in emotional_words:
-        if word in filename_lower:
-            context_keywords.append(word)
-    
-    # Check for time indicators
-    time_indicators = ['today', 'yesterday', 'morning', 'night', 'weekend', 'holiday', 'birthday', 'anniversary']
-    for word in time_indicators:
-        if word in filename_lower:
-            context_keywords.append(word)
-    
-    # Check for location indicators
-    location_words = ['home', 'office', 'gym', 'park', 'beach', 'city', 'country', 'world']
-    for word in location_words:
-        if word in filename_lower:
-            context_keywords.append(word)
+    context_keywords = [content_type for content_type, keywords in _FILENAME_CONTENT_TYPES
+                        if any(keyword in filename_lower for keyword in keywords)]
+    context_keywords.extend(word for word in _FILENAME_CONTEXT_WORDS if word in filename_lower)
     
     return context_keywords[:5]  # Return top 5 most relevant context clues
 
+def _write_text_file(path: str, content: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
 @app.route('/api/save_caption', methods=['POST'])
 def save_caption():
     """Save caption and title to file"""
@@ -3619,19 +4236,15 @@ def save_caption():
         hashtags = data.get('hashtags', '')
         title = data.get('title', '')
         
-        # Create captions directory if it doesn't exist
-        captions_dir = 'captions'
-        os.makedirs(captions_dir, exist_ok=True)
-        
-        # Create caption file
+        # Create caption file (captions dir is created at startup)
         caption_filename = f"{os.path.splitext(filename)[0]}.txt"
-        caption_path = os.path.join(captions_dir, caption_filename)
+        caption_path = os.path.join(_CAPTIONS_DIR, caption_filename)
         
         # Save caption content with title
         caption_content = f"Title: {title}\n\nCaption: {caption}\n\nHashtags: {hashtags}\n\nGenerated: {datetime.now().isoformat()}"
         
-        with open(caption_path, 'w', encoding='utf-8') as f:
-            f.write(caption_content)
+        # Regular file writes don't yield to gevent; keep them off the hub
+        _off_hub(_write_text_file, caption_path, caption_content)
         
         return jsonify({
             'success': True,
@@ -3652,9 +4265,8 @@ def load_caption():
             return jsonify({'success': False, 'error': 'Filename is required'}), 400
         
         # Look for caption file
-        captions_dir = 'captions'
         caption_filename = f"{os.path.splitext(filename)[0]}.txt"
-        caption_path = os.path.join(captions_dir, caption_filename)
+        caption_path = os.path.join(_CAPTIONS_DIR, caption_filename)
         
         if os.path.exists(caption_path):
             with open(caption_path, 'r', encoding='utf-8') as f:
@@ -3691,27 +4303,11 @@ def load_caption():
         logging.error(f"Error loading caption: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/generate_caption_variations', methods=['POST'])
-def generate_caption_variations():
-    """Generate multiple caption variations for a video using Gemini AI"""
-    try:
-        data = request.get_json()
-        if not data or 'filename' not in data:
-            return jsonify({'success': False, 'error': 'Filename is required'}), 400
-        
-        filename = data['filename']
-        
-        # Extract video information from filename
-        video_name = os.path.splitext(filename)[0]
-        
-        # Analyze filename for context clues
-        context_keywords = analyze_filename_for_context(video_name)
-        
-        # Generate multiple caption variations using Gemini AI
-        prompt = f"""
+# Caption-variations prompt; rendered with video_name=..., context=...
+_CAPTION_VARIATIONS_PROMPT = _compile_prompt("""
         Generate 3 different compelling, story-focused social media captions for a video titled "{video_name}".
         
-        Context clues from filename: {', '.join(context_keywords) if context_keywords else 'No specific context detected'}
+        Context clues from filename: {context}
         
         Requirements for each caption:
         1. Create captivating captions that tell a story and make people want to watch
@@ -3739,7 +4335,26 @@ def generate_caption_variations():
         
         Make each caption feel personal and authentic, like it's coming from a real person sharing a meaningful story.
         Use the context clues to make the captions more relevant and specific.
-        """
+        """)
+
+@app.route('/api/generate_caption_variations', methods=['POST'])
+def generate_caption_variations():
+    """Generate multiple caption variations for a video using Gemini AI"""
+    try:
+        data = request.get_json()
+        if not data or 'filename' not in data:
+            return jsonify({'success': False, 'error': 'Filename is required'}), 400
+        
+        filename = data['filename']
+        
+        # Extract video information from filename
+        video_name = os.path.splitext(filename)[0]
+        
+        # Analyze filename for context clues
+        context_keywords = analyze_filename_for_context(video_name)
+        
+        # Generate multiple caption variations using Gemini AI
+        prompt = _render_prompt(_CAPTION_VARIATIONS_PROMPT, video_name=video_name, context=_context_clues_text(context_keywords))
         
         try:
             response = model.generate_content(prompt)
@@ -3901,39 +4516,22 @@ def youtube_upload():
         file_size = os.path.getsize(full_path)
         logging.info(f"Video file size: {file_size / (1024*1024):.2f} MB")
         
+        # Opt-in background mode: return a job id immediately and let the client poll
+        if data.get('async'):
+            job_id = uuid.uuid4().hex
+            with _UPLOAD_LOCK:
+                _prune_upload_jobs()
+                _UPLOAD_PROGRESS[job_id] = 0
+                future = _UPLOAD_POOL.submit(_do_youtube_upload, job_id, user['id'], full_path, video_path, title, description, tags, privacy)
+                _UPLOAD_JOBS[job_id] = (user['id'], future)
+            # Outside the lock: the callback runs inline if the job already finished
+            future.add_done_callback(lambda _f: _mark_upload_done(job_id))
+            logging.info(f"Queued YouTube upload job {job_id} for: {title}")
+            return jsonify({'success': True, 'job_id': job_id, 'status_url': f'/api/youtube/upload/status/{job_id}'}), 202
+
         # Use the simplified upload function
         logging.info(f"Starting YouTube upload for: {title}")
-        result = upload_video_simple(full_path, title, description, tags, privacy)
-
-        # Enrich unknown errors with hints
-        if not result.get('success'):
-            client_secrets_exists = os.path.exists('client_secrets.json')
-            token_path = _get_youtube_token_file(for_save=False)
-            token_exists = os.path.exists(token_path)
-            result.setdefault('details', {})
-            result['details'].update({
-                'client_secrets_exists': client_secrets_exists,
-                'token_file': token_path,
-                'token_exists': token_exists
-            })
-        
-        if result['success']:
-            logging.info(f"YouTube upload successful: {result.get('video_url', 'No URL')}")
-            # Save upload record scoped to user
-            if user:
-                save_upload_record(user['id'], video_path, result)
-            try:
-                # Set uploaded flag in scheduled posts if present
-                schedules = _load_schedules()
-                for job in schedules:
-                    if job.get('user_id') == (user['id'] if user else None) and os.path.basename(job.get('video_path','')) == os.path.basename(video_path):
-                        job['status'] = 'uploaded'
-                _save_schedules(schedules)
-            except Exception:
-                pass
-        else:
-            logging.error(f"YouTube upload failed: {result.get('error', 'Unknown error')}")
-            
+        result = _do_youtube_upload(None, user['id'], full_path, video_path, title, description, tags, privacy)
         return jsonify(result)
         
     except Exception as e:
@@ -3941,6 +4539,73 @@ def youtube_upload():
         token_path = _get_youtube_token_file(for_save=False)
         return jsonify({'success': False, 'error': str(e), 'token_file': token_path, 'client_secrets_exists': os.path.exists('client_secrets.json')}), 500
 
+def _do_youtube_upload(job_id, user_id, full_path, video_path, title, description, tags, privacy):
+    """Run an upload and record the outcome; shared by the inline and background paths."""
+    def _progress(pct):
+        with _UPLOAD_LOCK:
+            _UPLOAD_PROGRESS[job_id] = pct
+    result = upload_video_simple(full_path, title, description, tags, privacy,
+                                 progress_cb=_progress if job_id else None)
+
+    # Enrich unknown errors with hints
+    if not result.get('success'):
+        client_secrets_exists = os.path.exists('client_secrets.json')
+        token_path = _get_youtube_token_file(for_save=False)
+        token_exists = os.path.exists(token_path)
+        result.setdefault('details', {})
+        result['details'].update({
+            'client_secrets_exists': client_secrets_exists,
+            'token_file': token_path,
+            'token_exists': token_exists
+        })
+
+    if result['success']:
+        logging.info(f"YouTube upload successful: {result.get('video_url', 'No URL')}")
+        # Save upload record scoped to user
+        save_upload_record(user_id, video_path, result)
+        try:
+            # Set uploaded flag in scheduled posts if present
+            schedules = _load_schedules()
+            for job in schedules:
+                if job.get('user_id') == user_id and os.path.basename(job.get('video_path','')) == os.path.basename(video_path):
+                    job['status'] = 'uploaded'
+            _save_schedules(schedules)
+        except Exception:
+            pass
+    else:
+        logging.error(f"YouTube upload failed: {result.get('error', 'Unknown error')}")
+    return result
+
+@app.route('/api/youtube/upload/status/<job_id>', methods=['GET'])
+def youtube_upload_status(job_id):
+    """Poll a background YouTube upload started with {"async": true}"""
+    try:
+        user = get_session_user()
+        if not user:
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+        with _UPLOAD_LOCK:
+            _prune_upload_jobs()
+            entry = _UPLOAD_JOBS.get(job_id)
+            progress = _UPLOAD_PROGRESS.get(job_id, 0)
+        if not entry or entry[0] != user['id']:
+            return jsonify({'success': False, 'error': 'Upload job not found'}), 404
+        future = entry[1]
+        if not future.done():
+            return jsonify({'success': True, 'done': False, 'job_id': job_id, 'progress': progress})
+        # Finished jobs are reported once and then forgotten
+        with _UPLOAD_LOCK:
+            _UPLOAD_JOBS.pop(job_id, None)
+            _UPLOAD_PROGRESS.pop(job_id, None)
+            _UPLOAD_DONE_AT.pop(job_id, None)
+        try:
+            result = future.result(timeout=0)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        return jsonify({**result, 'done': True, 'job_id': job_id, 'progress': 100 if result.get('success') else progress})
+    except Exception as e:
+        logging.error(f"YouTube upload status error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/youtube/channel', methods=['GET'])
 def youtube_channel_info():
     """Get YouTube channel information"""
@@ -4061,17 +4726,64 @@ def youtube_refresh():
         logging.error(f"YouTube refresh error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Upload history is append-only: one JSON record per line, never rewritten.
+# Records from the older youtube_uploads.json array are still read.
+UPLOADS_LOG = 'youtube_uploads.jsonl'
+UPLOADS_FILE_LEGACY = 'youtube_uploads.json'
+_UPLOADS_LOG_LOCK = threading.Lock()
+
+_UPLOADS_LOG_CACHE = (None, [])  # ((st_mtime_ns, st_size), records)
+
+def _load_upload_records() -> list:
+    global _UPLOADS_LOG_CACHE
+    records = list(_read_json_safe(UPLOADS_FILE_LEGACY) or [])
+    try:
+        st = os.stat(UPLOADS_LOG)
+    except OSError:
+        return records
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached_stamp, logged = _UPLOADS_LOG_CACHE
+    if cached_stamp != stamp:
+        logged = []
+        try:
+            with open(UPLOADS_LOG, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            logged.append(json.loads(line))
+                        except ValueError:
+                            continue  # torn trailing line from a crash mid-append
+        except FileNotFoundError:
+            pass
+        _UPLOADS_LOG_CACHE = (stamp, logged)
+    return records + logged
+
+def _upload_files_stamp() -> tuple:
+    stamps = []
+    for path in (UPLOADS_FILE_LEGACY, UPLOADS_LOG):
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+@functools.lru_cache(maxsize=4)
+def _uploaded_filenames_index(stamp: tuple) -> dict:
+    """user_id -> frozenset of uploaded filenames, built once per file revision."""
+    index = {}
+    for u in _load_upload_records():
+        if u.get('status') == 'uploaded':
+            index.setdefault(u.get('user_id'), set()).add(u.get('filename'))
+    return {uid: frozenset(names) for uid, names in index.items()}
+
+def _uploaded_filenames_for(user_id) -> frozenset:
+    return _uploaded_filenames_index(_upload_files_stamp()).get(user_id, frozenset())
+
 def save_upload_record(user_id: int, video_path: str, upload_result: dict):
     """Save YouTube upload record scoped to a user"""
     try:
-        uploads_file = 'youtube_uploads.json'
-        uploads = []
-        
-        # Load existing uploads
-        if os.path.exists(uploads_file):
-            with open(uploads_file, 'r') as f:
-                uploads = json.load(f)
-        
         # Add new upload record
         upload_record = {
             'user_id': user_id,
@@ -4084,11 +4796,12 @@ def save_upload_record(user_id: int, video_path: str, upload_result: dict):
             'status': 'uploaded'
         }
         
-        uploads.append(upload_record)
-        
-        # Save back to file
-        with open(uploads_file, 'w') as f:
-            json.dump(uploads, f, indent=2)
+        line = json.dumps(upload_record) + '\n'
+        with _UPLOADS_LOG_LOCK:
+            with open(UPLOADS_LOG, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
             
         logging.info(f"YouTube upload record saved: {upload_result.get('video_id')}")
         
@@ -4168,7 +4881,7 @@ def api_schedule_post():
         # Prepare job
         tags = [t.lstrip('#') for t in (hashtags or '').split() if t.startswith('#')]
         job = {
-            'id': str(uuid.uuid4()),
+            'id': uuid.uuid4().hex,
             'user_id': user['id'],
             'platform': platform,
             'video_path': video_path,
@@ -4178,6 +4891,7 @@ def api_schedule_post():
             'tags': tags,
             'privacy': 'public',
             'run_at_iso': run_at_iso,
+            'run_at_ts': run_ts,
             'status': 'pending',
             'created_at': datetime.utcnow().isoformat()
         }
@@ -4206,7 +4920,7 @@ def scheduled_posts_page():
     try:
         user = get_session_user()
         if not user:
-            return redirect(url_for('navigate', page='login'))
+            return redirect(_NAV_REDIRECTS['login'])
         
         # Load scheduled posts for the user
         schedules = _load_schedules()
@@ -4292,11 +5006,7 @@ def api_execute_post():
             tags = job.get('tags', [])
             privacy = job.get('privacy', 'public')
             
-            # Resolve per-user path
-            user_trimmed = get_user_subdir(user['id'], 'trimmed')
-            candidate = os.path.join(user_trimmed, os.path.basename(video_path))
-            resolved = candidate if os.path.exists(candidate) else video_path
-            
+            resolved = _resolve_user_video(user['id'], video_path)
             result = upload_video_simple(resolved, title, description, tags, privacy)
             
             if result.get('success'):
@@ -4371,7 +5081,12 @@ if __name__ == '__main__':
         # Start the Flask application
         port = int(os.environ.get('PORT', PORT))
         logger.info(f"Starting AI Auto-Posting application on port {port}")
-        app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
+        if _USE_GEVENT:
+            # Single process so the scheduler is not duplicated across workers
+            from gevent.pywsgi import WSGIServer
+            WSGIServer(('0.0.0.0', port), app, log=None).serve_forever()
+        else:
+            app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
         
     except Exception as e:
         logger.error(f"Failed to start application: {e}")